@@ -13,59 +13,106 @@ Date: December 2025
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
 import json
 from datetime import datetime
+from typing import Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
 
-def load_baseline_data(processed_dir: Path):
-    """Lädt Baseline-Daten (v2.1.0) aus Backup."""
-    backup_dir = processed_dir / 'backup_v2.1.0_baseline'
-
-    data = {}
-
-    # ISBN/ISSN data
-    isbn_file = backup_dir / 'dnb_raw_data.parquet'
-    if isbn_file.exists():
-        data['isbn_issn'] = pd.read_parquet(isbn_file)
+# Rohdaten-Dateien pro Abfrage-Methode
+METHOD_FILES = {
+    'isbn_issn': 'dnb_raw_data.parquet',
+    'title_author': 'dnb_title_author_data.parquet',
+    'title_year': 'dnb_title_year_data.parquet',
+}
+
+# Für Erfolgsraten und Vergleich genügen diese Spalten
+KEY_COLUMNS = ['vdeh_id', 'dnb_found']
+
+
+def _load_method_data(
+    data_dir: Path,
+    columns: Optional[list] = None,
+    methods: Optional[list] = None
+) -> dict:
+    """
+    Lädt die DNB-Rohdaten der Methoden aus einem Verzeichnis.
+
+    Args:
+        data_dir: Verzeichnis mit den Parquet-Dateien
+        columns: Zu lesende Spalten (None = alle)
+        methods: Zu ladende Methoden (None = alle aus METHOD_FILES)
+
+    Returns:
+        Dict {Methode: DataFrame}
+    """
+    files = {}
+    for method, filename in METHOD_FILES.items():
+        if methods is not None and method not in methods:
+            continue
 
-    # Title/Author data
-    ta_file = backup_dir / 'dnb_title_author_data.parquet'
-    if ta_file.exists():
-        data['title_author'] = pd.read_parquet(ta_file)
+        file_path = data_dir / filename
+        if file_path.exists():
+            files[method] = file_path
+
+    if not files:
+        return {}
+
+    if columns is not None:
+        # Projizierte Spalten sind in allen Dateien gleich: ein gemeinsamer
+        # Dataset-Scan liest die Dateien parallel (memory-mapped)
+        # Absolute POSIX-Pfade: Fragment-Pfade lassen sich so unabhängig von
+        # relativem data_dir oder Windows-Trennzeichen wieder zuordnen
+        paths = {method: p.resolve().as_posix() for method, p in files.items()}
+        dataset = ds.dataset(
+            list(paths.values()),
+            format='parquet',
+            filesystem=pafs.LocalFileSystem(use_mmap=True)
+        )
+        scanner = dataset.scanner(columns=columns, use_threads=True)
+        batches = {path: [] for path in paths.values()}
+        for tagged in scanner.scan_batches():
+            batches[Path(tagged.fragment.path).resolve().as_posix()].append(tagged.record_batch)
+
+        frames = {
+            method: pa.Table.from_batches(
+                batches[path], schema=scanner.projected_schema
+            ).to_pandas()
+            for method, path in paths.items()
+        }
+    else:
+        # Vollständige Tabellen haben je Methode eigene Spalten: einzeln lesen
+        frames = {
+            # memory_map: Datei direkt aus dem Page Cache lesen statt zu puffern
+            method: pd.read_parquet(file_path, engine='pyarrow', memory_map=True)
+            for method, file_path in files.items()
+        }
 
-    # Title/Year data
-    ty_file = backup_dir / 'dnb_title_year_data.parquet'
-    if ty_file.exists():
-        data['title_year'] = pd.read_parquet(ty_file)
+    data = {}
+    for method, df in frames.items():
+        # dnb_found einmalig auf bool normalisieren (None/NaN = nicht gefunden)
+        df['dnb_found'] = df['dnb_found'].eq(True)
+        data[method] = df
 
     return data
 
 
-def load_enhanced_data(processed_dir: Path):
-    """Lädt Enhanced-Daten (v2.2.0) nach Re-Run."""
-    data = {}
-
-    # ISBN/ISSN data
-    isbn_file = processed_dir / 'dnb_raw_data.parquet'
-    if isbn_file.exists():
-        data['isbn_issn'] = pd.read_parquet(isbn_file)
-
-    # Title/Author data
-    ta_file = processed_dir / 'dnb_title_author_data.parquet'
-    if ta_file.exists():
-        data['title_author'] = pd.read_parquet(ta_file)
+def load_baseline_data(processed_dir: Path, columns: Optional[list] = None, methods: Optional[list] = None):
+    """Lädt Baseline-Daten (v2.1.0) aus Backup."""
+    return _load_method_data(processed_dir / 'backup_v2.1.0_baseline', columns=columns, methods=methods)
 
-    # Title/Year data
-    ty_file = processed_dir / 'dnb_title_year_data.parquet'
-    if ty_file.exists():
-        data['title_year'] = pd.read_parquet(ty_file)
 
-    return data
+def load_enhanced_data(processed_dir: Path, columns: Optional[list] = None, methods: Optional[list] = None):
+    """Lädt Enhanced-Daten (v2.2.0) nach Re-Run."""
+    return _load_method_data(processed_dir, columns=columns, methods=methods)
 
 
 def calculate_success_rates(data: dict) -> dict:
@@ -75,7 +122,7 @@ def calculate_success_rates(data: dict) -> dict:
     for method, df in data.items():
         if df is not None and len(df) > 0:
             total = len(df)
-            found = (df['dnb_found'] == True).sum()
+            found = df['dnb_found'].sum()
             rate = found / total * 100
 
             rates[method] = {
@@ -100,8 +147,8 @@ def compare_strategies(baseline_data: dict, enhanced_data: dict) -> dict:
             continue
 
         # Erfolgsraten
-        baseline_found = (baseline_df['dnb_found'] == True).sum()
-        enhanced_found = (enhanced_df['dnb_found'] == True).sum()
+        baseline_found = baseline_df['dnb_found'].sum()
+        enhanced_found = enhanced_df['dnb_found'].sum()
 
         baseline_rate = baseline_found / len(baseline_df) * 100
         enhanced_rate = enhanced_found / len(enhanced_df) * 100
@@ -110,6 +157,11 @@ def compare_strategies(baseline_data: dict, enhanced_data: dict) -> dict:
         new_matches = enhanced_found - baseline_found
         improvement = enhanced_rate - baseline_rate
 
+        # Records, die nur in Enhanced gefunden wurden (Mengendifferenz der IDs, ohne Merge)
+        enhanced_ids = enhanced_df.loc[enhanced_df['dnb_found'], 'vdeh_id'].to_numpy()
+        baseline_ids = baseline_df.loc[baseline_df['dnb_found'], 'vdeh_id'].to_numpy()
+        new_records = len(np.setdiff1d(enhanced_ids, baseline_ids))
+
         comparison[method] = {
             'baseline': {
                 'total': len(baseline_df),
@@ -124,7 +176,8 @@ def compare_strategies(baseline_data: dict, enhanced_data: dict) -> dict:
             'delta': {
                 'new_matches': new_matches,
                 'improvement_pct': improvement,
-                'improvement_abs': new_matches
+                'improvement_abs': new_matches,
+                'new_records': new_records
             }
         }
 
@@ -142,26 +195,32 @@ def analyze_new_matches(baseline_data: dict, enhanced_data: dict) -> pd.DataFram
         if baseline_df is None or enhanced_df is None:
             continue
 
-        # Merge um Unterschiede zu finden
-        merged = enhanced_df.merge(
-            baseline_df[['vdeh_id', 'dnb_found']],
+        # Baseline-Status pro vdeh_id (gefunden, wenn irgendeine Abfrage der ID, z.B. ISBN
+        # oder ISSN, gefunden wurde) - gleiches Kriterium wie new_records in compare_strategies.
+        # Eindeutiger Index, daher vervielfacht der Join keine Zeilen
+        baseline_found = (
+            baseline_df.groupby('vdeh_id', sort=False)['dnb_found'].any().rename('dnb_found_baseline')
+        )
+        merged = enhanced_df.rename(columns={'dnb_found': 'dnb_found_enhanced'}).join(
+            baseline_found,
             on='vdeh_id',
-            how='left',
-            suffixes=('_enhanced', '_baseline')
+            how='left'
         )
 
         # Neue Matches: In Enhanced gefunden, aber nicht in Baseline
         new_in_enhanced = merged[
-            (merged['dnb_found_enhanced'] == True) &
-            ((merged['dnb_found_baseline'] == False) | (merged['dnb_found_baseline'].isna()))
+            merged['dnb_found_enhanced'] & merged['dnb_found_baseline'].ne(True)
         ]
 
         if len(new_in_enhanced) > 0:
-            new_in_enhanced['method'] = method
-            new_matches_list.append(new_in_enhanced)
+            new_in_enhanced = new_in_enhanced.assign(
+                method=pd.Categorical([method] * len(new_in_enhanced), categories=list(METHOD_FILES))
+            )
+            new_matches_list.append(pa.Table.from_pandas(new_in_enhanced, preserve_index=False))
 
     if new_matches_list:
-        return pd.concat(new_matches_list, ignore_index=True)
+        # Arrow-Concat übernimmt die Spaltenpuffer ohne erneutes Kopieren
+        return pa.concat_tables(new_matches_list, promote_options='permissive').to_pandas()
     else:
         return pd.DataFrame()
 
@@ -199,6 +258,7 @@ def print_comparison_report(comparison: dict):
         improvement_symbol = "✅" if delta['improvement_pct'] > 0 else "⚠️"
         print(f"    {improvement_symbol} Neue Matches:     {delta['new_matches']:+,}")
         print(f"    {improvement_symbol} Rate-Änderung:    {delta['improvement_pct']:+.2f} Prozentpunkte")
+        print(f"    🆕 Neu gefundene Records: {delta['new_records']:,}")
 
         if delta['improvement_pct'] > 0:
             relative_improvement = (delta['new_matches'] / baseline['found'] * 100) if baseline['found'] > 0 else 0
@@ -234,11 +294,12 @@ def main():
         print(f"   Bitte zuerst Backup erstellen!")
         return 1
 
+    # Für den Vergleich nur die Schlüsselspalten laden
     print("🔍 Lade Baseline-Daten (v2.1.0)...")
-    baseline_data = load_baseline_data(processed_dir)
+    baseline_data = load_baseline_data(processed_dir, columns=KEY_COLUMNS)
 
     print("🔍 Lade Enhanced-Daten (v2.2.0)...")
-    enhanced_data = load_enhanced_data(processed_dir)
+    enhanced_data = load_enhanced_data(processed_dir, columns=KEY_COLUMNS)
 
     # Prüfe ob beide Datensätze vorhanden
     if not baseline_data or not enhanced_data:
@@ -262,7 +323,14 @@ def main():
     print("🔬 NEUE MATCHES ANALYSE")
     print(f"{'=' * 80}")
 
-    new_matches = analyze_new_matches(baseline_data, enhanced_data)
+    # Vollständige Enhanced-Daten nur für Methoden mit neu gefundenen Records laden
+    # (new_records > 0 genau dann, wenn analyze_new_matches für die Methode Zeilen liefert)
+    new_methods = [method for method, data in comparison.items() if data['delta']['new_records'] > 0]
+    if new_methods:
+        enhanced_full = load_enhanced_data(processed_dir, methods=new_methods)
+        new_matches = analyze_new_matches(baseline_data, enhanced_full)
+    else:
+        new_matches = pd.DataFrame()
 
     if len(new_matches) > 0:
         print(f"\n✨ Insgesamt {len(new_matches):,} neue Matches gefunden!")
@@ -273,7 +341,15 @@ def main():
 
         # Speichere neue Matches für detaillierte Analyse
         output_file = processed_dir / 'new_matches_v2.2.0.parquet'
-        new_matches.to_parquet(output_file, index=False)
+        new_matches.to_parquet(
+            output_file,
+            index=False,
+            engine='pyarrow',
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=['method', 'vdeh_id'],
+            row_group_size=200_000
+        )
         print(f"\n💾 Neue Matches gespeichert: {output_file.name}")
     else:
         print("\nℹ️  Keine neuen Matches gefunden (oder Daten noch nicht mit v2.2.0 abgefragt)")
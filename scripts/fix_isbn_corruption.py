@@ -17,11 +17,17 @@ Schritte:
 Geschätzte Dauer: ~50-60 Minuten
 """
 
+import argparse
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import sys
 from pathlib import Path
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
 
@@ -32,12 +38,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Copy-on-Write: Filter/Joins teilen Puffer statt defensiver Kopien (ab pandas 3.0 Standard)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from config_loader import VDEHConfig
-from dnb_api import query_dnb_by_isbn, query_dnb_by_issn
+from dnb_api import (
+    query_dnb_by_isbns_bulk, query_dnb_by_issn, AdaptiveRateLimiter, create_session
+)
+from dnb_cache import DNBCache
 
 def create_backup(file_path: Path, backup_dir: Path) -> Path:
     """Erstellt ein Backup einer Datei."""
@@ -55,20 +68,38 @@ def create_backup(file_path: Path, backup_dir: Path) -> Path:
 def identify_corrupted_isbns(dnb_raw_df: pd.DataFrame) -> pd.DataFrame:
     """Identifiziert korrupte ISBN-Einträge."""
     # ISBNs mit Länge > 15 sind korrupt (normale ISBN-10 = 10, ISBN-13 = 13)
-    corrupted = dnb_raw_df[
-        (dnb_raw_df['query_type'] == 'ISBN') &
-        (dnb_raw_df['query_value'].str.len() > 15)
-    ].copy()
+    # Maske direkt mit Arrow-Kernels berechnen (keine Python-Strings pro Zeile)
+    query_type = pa.array(dnb_raw_df['query_type'], type=pa.string(), from_pandas=True)
+    query_value = pa.array(dnb_raw_df['query_value'], type=pa.string(), from_pandas=True)
+    mask = pc.and_(
+        pc.equal(query_type, 'ISBN'),
+        pc.greater(pc.utf8_length(query_value), 15)
+    )
+    mask = pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+    corrupted = dnb_raw_df[mask]
 
     logger.info(f"📊 Korrupte ISBN-Einträge gefunden: {len(corrupted):,}")
     return corrupted
 
-def fix_dnb_raw_data(data_dir: Path, rate_limit: float = 1.0) -> tuple[pd.DataFrame, int]:
+def fix_dnb_raw_data(
+    data_dir: Path,
+    rate_limit: float = 1.0,
+    cache: DNBCache = None,
+    max_workers: int = 8,
+    batch_size: int = 25
+) -> tuple[pa.Table, int]:
     """
     Behebt korrupte ISBNs in dnb_raw_data.parquet.
 
+    Args:
+        data_dir: Verzeichnis der verarbeiteten VDEH-Daten
+        rate_limit: Start-Abstand zwischen DNB-Anfragen in Sekunden
+        cache: Persistenter DNB-Cache (None = ohne Cache)
+        max_workers: Anzahl paralleler DNB-Anfragen (Rate begrenzt der gemeinsame Limiter)
+        batch_size: Anzahl ISBNs pro SRU-Anfrage (OR-verknüpft)
+
     Returns:
-        Tuple aus (bereinigte DNB-Daten, Anzahl neu abgefragter ISBNs)
+        Tuple aus (bereinigte DNB-Daten als Arrow-Tabelle, Anzahl neu abgefragter ISBNs)
     """
     dnb_raw_path = data_dir / 'dnb_raw_data.parquet'
 
@@ -77,7 +108,7 @@ def fix_dnb_raw_data(data_dir: Path, rate_limit: float = 1.0) -> tuple[pd.DataFr
     logger.info("="*70)
 
     # Load data
-    dnb_raw = pd.read_parquet(dnb_raw_path)
+    dnb_raw = pd.read_parquet(dnb_raw_path, dtype_backend='pyarrow')
     logger.info(f"📂 DNB Raw Data geladen: {len(dnb_raw):,} Einträge")
 
     # Identify corrupted entries
@@ -85,193 +116,283 @@ def fix_dnb_raw_data(data_dir: Path, rate_limit: float = 1.0) -> tuple[pd.DataFr
 
     if len(corrupted) == 0:
         logger.info("✅ Keine korrupten ISBNs gefunden!")
-        return dnb_raw, 0
+        return pa.Table.from_pandas(dnb_raw, preserve_index=False), 0
 
     # Get original ISBNs from VDEH data
-    vdeh_data = pd.read_parquet(data_dir / '03_language_detected_data.parquet')
+    vdeh_data = pd.read_parquet(data_dir / '03_language_detected_data.parquet', columns=['id', 'isbn'], dtype_backend='pyarrow')
 
     # Remove corrupted entries
     logger.info(f"🗑️  Lösche {len(corrupted):,} korrupte Einträge...")
-    dnb_raw_clean = dnb_raw[~dnb_raw.index.isin(corrupted.index)].copy()
+    dnb_raw_clean = dnb_raw.loc[~dnb_raw.index.isin(corrupted.index)]
 
-    # Prepare re-queries
+    # Prepare re-queries: Original-ISBNs per Index-Lookup statt Scan pro Record
     logger.info(f"📋 Bereite Neuabfragen vor...")
-    requery_list = []
+    vdeh_isbn = vdeh_data.drop_duplicates('id').set_index('id')['isbn']
 
-    for _, corrupt_row in corrupted.iterrows():
-        vdeh_id = corrupt_row['vdeh_id']
+    missing = ~corrupted['vdeh_id'].isin(vdeh_isbn.index)
+    if missing.any():
+        logger.warning(f"⚠️  {missing.sum():,} VDEH IDs nicht gefunden - überspringe")
 
-        # Get original ISBN from VDEH
-        vdeh_row = vdeh_data[vdeh_data['id'] == vdeh_id]
-        if len(vdeh_row) == 0:
-            logger.warning(f"⚠️  VDEH ID {vdeh_id} nicht gefunden - überspringe")
-            continue
-
-        vdeh_row = vdeh_row.iloc[0]
-        original_isbn = vdeh_row.get('isbn')
+    requery_df = pd.DataFrame({
+        'vdeh_id': corrupted['vdeh_id'].to_numpy(),
+        'isbn': vdeh_isbn.reindex(corrupted['vdeh_id']).to_numpy(),
+        'query_type': 'ISBN'
+    })
+    requery_df = requery_df[requery_df['isbn'].notna()].reset_index(drop=True)
 
-        if pd.notna(original_isbn):
-            requery_list.append({
-                'vdeh_id': vdeh_id,
-                'isbn': original_isbn,
-                'query_type': 'ISBN'
-            })
+    # Identische ISBNs (gleiche ISBN an mehreren Records) nur einmal abfragen
+    # Normalisierte ISBN (ohne Bindestriche/Leerzeichen) ist Abfrage- und Cache-Schlüssel,
+    # sodass "978-3-..." und "9783..." nur eine Anfrage bzw. einen Cache-Eintrag erzeugen
+    requery_df['isbn_key'] = requery_df['isbn'].str.replace(r'[-\s]', '', regex=True)
+    unique_isbns = list(requery_df['isbn_key'].unique())
 
-    logger.info(f"🔄 {len(requery_list):,} ISBNs werden neu abgefragt...")
-    logger.info(f"⏱️  Geschätzte Dauer: ~{len(requery_list) * rate_limit / 60:.0f} Minuten")
+    logger.info(f"🔄 {len(requery_df):,} ISBNs werden neu abgefragt ({len(unique_isbns):,} eindeutig)...")
 
     # Re-query DNB
     from tqdm import tqdm
-    new_results = []
-    stats = {'found': 0, 'not_found': 0}
-
-    for item in tqdm(requery_list, desc="🔍 DNB Re-Query", unit="queries"):
-        # Query DNB
-        dnb_result = query_dnb_by_isbn(item['isbn'])
-
-        # Store result
-        result_row = {
-            'vdeh_id': item['vdeh_id'],
-            'query_type': item['query_type'],
-            'query_value': item['isbn'],
-            'dnb_found': dnb_result is not None,
-            'dnb_title': dnb_result.get('title') if dnb_result else None,
-            'dnb_authors': ', '.join(dnb_result.get('authors', [])) if dnb_result else None,
-            'dnb_year': dnb_result.get('year') if dnb_result else None,
-            'dnb_publisher': dnb_result.get('publisher') if dnb_result else None,
-            'dnb_isbn': dnb_result.get('isbn') if dnb_result else None,
-            'dnb_issn': dnb_result.get('issn') if dnb_result else None,
-            'dnb_pages': dnb_result.get('pages') if dnb_result else None
-        }
+    dnb_results = {}
+
+    # Ein Cache-Eintrag pro ISBN, unabhängig davon, in welchem Batch die ISBN abgefragt wurde.
+    # Eigener Key (query_dnb_by_isbns_bulk statt query_dnb_by_isbn): die OR-Abfrage kann bei
+    # mehreren Treffern einen anderen Record liefern als die Einzelabfrage. Da jede beantwortete
+    # ISBN sofort gespeichert wird, setzt ein abgebrochener Lauf mit den offenen ISBNs fort
+    def cache_key(isbn: str) -> str:
+        return DNBCache.make_key(query_dnb_by_isbns_bulk.__name__, (isbn,), {})
+
+    # Zuerst Cache prüfen, nur fehlende ISBNs gehen an die DNB
+    pending = unique_isbns
+    if cache is not None:
+        pending = []
+        for isbn in unique_isbns:
+            hit, result = cache.get(cache_key(isbn))
+            if hit:
+                dnb_results[isbn] = result
+            else:
+                pending.append(isbn)
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    # Adaptive Rate: startet bei 1/rate_limit Anfragen/s, bremst bei HTTP 429
+    limiter = AdaptiveRateLimiter(rate=1.0 / rate_limit)
+
+    # Die Worker teilen sich den Limiter, die Dauer bestimmt also die Rate (nicht max_workers).
+    # Bei der Start-Rate ist das eine Obergrenze, da die Rate bei Erfolg steigt
+    logger.info(
+        f"⏱️  Geschätzte Dauer: höchstens ~{len(batches) / limiter.rate / 60:.0f} Minuten "
+        f"({len(batches):,} Batch-Anfragen bei {limiter.rate:.2f} Anfragen/s Start-Rate)"
+    )
 
-        new_results.append(result_row)
+    # Je Batch eine SRU-Anfrage 'isbn=A or isbn=B ...'; Batches laufen parallel, der Limiter hält die Rate.
+    # Eine Session mit Pool pro Worker hält die Verbindungen offen (Keep-Alive)
+    with create_session(pool_maxsize=max_workers) as session, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                query_dnb_by_isbns_bulk, batch, batch_size=batch_size, limiter=limiter, session=session
+            )
+            for batch in batches
+        ]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="🔍 DNB Re-Query", unit="batches"):
+            batch_results = future.result()
+            dnb_results.update(batch_results)
+            # Nur beantwortete ISBNs cachen (Treffer oder echter Nicht-Treffer): fehlgeschlagene
+            # Abfragen fehlen in batch_results und werden beim nächsten Lauf erneut gestellt
+            if cache is not None:
+                for isbn, result in batch_results.items():
+                    cache.set(cache_key(isbn), result)
+
+    failed = len(pending) - sum(isbn in dnb_results for isbn in pending)
+    if failed:
+        logger.warning(f"⚠️  {failed:,} ISBNs konnten nicht abgefragt werden (nicht gecacht, als nicht gefunden übernommen)")
+
+    if cache is not None:
+        logger.info(f"💾 DNB-Cache: {cache.hits:,} Treffer, {cache.misses:,} neue Abfragen")
+
+    # Ergebnisse spaltenweise auf alle betroffenen Records verteilen
+    n = len(requery_df)
+    result_fields = {
+        'dnb_title': 'title',
+        'dnb_year': 'year',
+        'dnb_publisher': 'publisher',
+        'dnb_isbn': 'isbn',
+        'dnb_issn': 'issn',
+        'dnb_pages': 'pages'
+    }
+    cols = {
+        'vdeh_id': requery_df['vdeh_id'].to_numpy(),
+        'query_type': requery_df['query_type'].to_numpy(),
+        'query_value': requery_df['isbn'].to_numpy(),
+        'dnb_found': [False] * n,
+        'dnb_title': [None] * n,
+        'dnb_authors': [None] * n,
+        'dnb_year': [None] * n,
+        'dnb_publisher': [None] * n,
+        'dnb_isbn': [None] * n,
+        'dnb_issn': [None] * n,
+        'dnb_pages': [None] * n
+    }
+
+    for i, isbn_key in enumerate(requery_df['isbn_key']):
+        dnb_result = dnb_results.get(isbn_key)
+        if not dnb_result:
+            continue
 
-        if dnb_result:
-            stats['found'] += 1
-        else:
-            stats['not_found'] += 1
+        cols['dnb_found'][i] = True
+        cols['dnb_authors'][i] = ', '.join(dnb_result.get('authors', []))
+        for col, key in result_fields.items():
+            cols[col][i] = dnb_result.get(key)
 
-        # Rate limiting
-        time.sleep(rate_limit)
+    found = sum(cols['dnb_found'])
+    stats = {'found': found, 'not_found': n - found}
 
-    # Add new results to clean data
-    new_results_df = pd.DataFrame(new_results)
-    dnb_raw_fixed = pd.concat([dnb_raw_clean, new_results_df], ignore_index=True)
+    # Add new results to clean data: Arrow-Tabellen verketten nur die Chunk-Listen,
+    # die bereinigten Daten werden dabei nicht kopiert (anders als pd.concat)
+    new_results_df = pd.DataFrame(cols).astype({'dnb_found': 'bool', 'dnb_year': 'Int64'})
+    clean_table = pa.Table.from_pandas(dnb_raw_clean, preserve_index=False)
+    new_table = pa.Table.from_pandas(new_results_df, preserve_index=False)
+    dnb_raw_fixed = pa.concat_tables([clean_table, new_table], promote_options='permissive')
+    # pandas-Metadaten der bereinigten Tabelle passen nach der Typ-Promotion ggf. nicht mehr
+    # (z.B. null[pyarrow] -> string); ohne sie leitet pandas die Typen aus dem Arrow-Schema ab
+    dnb_raw_fixed = dnb_raw_fixed.replace_schema_metadata(None)
 
     # Save fixed data
-    dnb_raw_fixed.to_parquet(dnb_raw_path, index=False)
+    pq.write_table(
+        dnb_raw_fixed,
+        dnb_raw_path,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=['query_type', 'dnb_publisher', 'dnb_authors'],
+        row_group_size=131_072
+    )
     logger.info(f"💾 Bereinigte DNB-Daten gespeichert: {dnb_raw_path.name}")
 
     logger.info(f"\n📊 Neuabfrage-Ergebnisse:")
-    logger.info(f"   ✅ Gefunden: {stats['found']:,} ({stats['found']/len(requery_list)*100:.1f}%)")
-    logger.info(f"   ❌ Nicht gefunden: {stats['not_found']:,} ({stats['not_found']/len(requery_list)*100:.1f}%)")
+    logger.info(f"   ✅ Gefunden: {stats['found']:,} ({stats['found']/len(requery_df)*100:.1f}%)")
+    logger.info(f"   ❌ Nicht gefunden: {stats['not_found']:,} ({stats['not_found']/len(requery_df)*100:.1f}%)")
 
-    return dnb_raw_fixed, len(requery_list)
+    return dnb_raw_fixed, len(requery_df)
 
-def run_enrichment_merge(data_dir: Path):
-    """Führt den DNB Enrichment Merge neu aus."""
-    logger.info("\n" + "="*70)
-    logger.info("SCHRITT 2: DNB Enrichment Merge")
-    logger.info("="*70)
+def factorize_ids(frames: list[pd.DataFrame], cols: list[str]) -> list[np.ndarray]:
+    """
+    Kodiert ID-Spalten mehrerer DataFrames mit gemeinsamen int32-Codes.
 
-    # Load data
-    vdeh = pd.read_parquet(data_dir / '03_language_detected_data.parquet')
-    dnb_raw = pd.read_parquet(data_dir / 'dnb_raw_data.parquet')
-    dnb_ta = pd.read_parquet(data_dir / 'dnb_title_author_data.parquet')
-    dnb_ty = pd.read_parquet(data_dir / 'dnb_title_year_data.parquet')
+    Gleiche IDs erhalten in allen Frames denselben Code, sodass Joins über
+    kompakte Integer-Schlüssel statt über Strings laufen.
 
-    logger.info(f"📂 Daten geladen:")
-    logger.info(f"   VDEH: {len(vdeh):,}")
-    logger.info(f"   DNB Raw: {len(dnb_raw):,}")
-    logger.info(f"   DNB Title/Author: {len(dnb_ta):,}")
-    logger.info(f"   DNB Title/Year: {len(dnb_ty):,}")
+    Args:
+        frames: Liste der DataFrames
+        cols: ID-Spalte je DataFrame
 
-    # Start with VDEH data
-    df_enriched = vdeh.copy()
+    Returns:
+        Liste der Code-Arrays (gleiche Reihenfolge wie frames)
+    """
+    codes, _ = pd.factorize(pd.concat([df[col] for df, col in zip(frames, cols)], ignore_index=True))
+    codes = codes.astype('int32')
 
-    # Merge ISBN/ISSN-based DNB data
-    cols_to_merge = ['vdeh_id', 'query_type', 'dnb_title', 'dnb_authors',
-                     'dnb_year', 'dnb_publisher', 'dnb_isbn', 'dnb_issn', 'dnb_pages']
+    result = []
+    pos = 0
+    for df in frames:
+        result.append(codes[pos:pos + len(df)])
+        pos += len(df)
 
-    dnb_isbn_issn = dnb_raw[dnb_raw['dnb_found'] == True][cols_to_merge].rename(
-        columns={'query_type': 'dnb_query_method'}
-    )
+    return result
 
-    df_enriched = df_enriched.merge(
-        dnb_isbn_issn,
-        left_on='id',
-        right_on='vdeh_id',
-        how='left',
-        suffixes=('', '_dup')
-    )
+def to_default_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Wandelt ArrowDtype-Spalten in die Standard-pandas-Typen zurück.
+
+    Ergebnis entspricht einem pd.read_parquet ohne dtype_backend (Strings/Listen als
+    object bzw. str, Ganzzahlen mit Lücken als float64). Bereits gesetzte pandas-Typen
+    (Int64, category) bleiben erhalten. So schreibt die intern Arrow-basierte
+    Verarbeitung keine ArrowDtype-Metadaten in veröffentlichte Parquet-Dateien.
 
-    # Drop duplicates
-    if 'vdeh_id' in df_enriched.columns:
-        df_enriched.drop(columns=['vdeh_id'], inplace=True)
-    dup_cols = [c for c in df_enriched.columns if c.endswith('_dup')]
-    if dup_cols:
-        df_enriched.drop(columns=dup_cols, inplace=True)
+    Args:
+        df: DataFrame mit (teilweise) ArrowDtype-Spalten
 
-    logger.info(f"✅ ISBN/ISSN DNB-Daten gemerged")
+    Returns:
+        DataFrame mit Standard-pandas-Typen
+    """
+    arrow_cols = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.ArrowDtype)]
+    if not arrow_cols:
+        return df
+    table = pa.Table.from_pandas(df[arrow_cols], preserve_index=False).replace_schema_metadata(None)
+    df = df.copy(deep=False)
+    df[arrow_cols] = table.to_pandas().set_axis(df.index)
+    return df
 
-    # Merge Title/Author data
+def run_enrichment_merge(data_dir: Path):
+    """Führt den DNB Enrichment Merge neu aus."""
+    logger.info("\n" + "="*70)
+    logger.info("SCHRITT 2: DNB Enrichment Merge")
+    logger.info("="*70)
+
+    cols_to_merge = ['vdeh_id', 'query_type', 'dnb_title', 'dnb_authors',
+                     'dnb_year', 'dnb_publisher', 'dnb_isbn', 'dnb_issn', 'dnb_pages']
     cols_ta = ['vdeh_id', 'dnb_title', 'dnb_authors', 'dnb_year',
                'dnb_publisher', 'dnb_isbn', 'dnb_issn', 'dnb_pages']
 
-    dnb_ta_matches = dnb_ta[dnb_ta['dnb_found'] == True][cols_ta].copy()
-    dnb_ta_matches = dnb_ta_matches.rename(columns={
-        'dnb_title': 'dnb_title_ta',
-        'dnb_authors': 'dnb_authors_ta',
-        'dnb_year': 'dnb_year_ta',
-        'dnb_publisher': 'dnb_publisher_ta',
-        'dnb_isbn': 'dnb_isbn_ta',
-        'dnb_issn': 'dnb_issn_ta',
-        'dnb_pages': 'dnb_pages_ta'
-    })
+    # Load data: DNB-Dateien nur mit benötigten Spalten und nur gefundene Records
+    found_filter = [('dnb_found', '==', True)]
+    read_specs = {
+        'vdeh': ('03_language_detected_data.parquet', {}),
+        'raw': ('dnb_raw_data.parquet', {'columns': cols_to_merge, 'filters': found_filter}),
+        'ta': ('dnb_title_author_data.parquet', {'columns': cols_ta, 'filters': found_filter}),
+        'ty': ('dnb_title_year_data.parquet', {'columns': cols_ta, 'filters': found_filter}),
+    }
+
+    # Parquet-Decoding gibt den GIL frei: die vier Dateien parallel lesen
+    with ThreadPoolExecutor(max_workers=len(read_specs)) as executor:
+        futures = {
+            name: executor.submit(pd.read_parquet, data_dir / filename, dtype_backend='pyarrow', **kwargs)
+            for name, (filename, kwargs) in read_specs.items()
+        }
+        vdeh, dnb_raw, dnb_ta, dnb_ty = (futures[name].result() for name in ('vdeh', 'raw', 'ta', 'ty'))
 
-    df_enriched = df_enriched.merge(
-        dnb_ta_matches,
-        left_on='id',
-        right_on='vdeh_id',
-        how='left'
+    # Typen vor dem Join festlegen: Jahre als Int64, Abfragemethode als Kategorie
+    for df in (dnb_raw, dnb_ta, dnb_ty):
+        df['dnb_year'] = pd.to_numeric(df['dnb_year'], errors='coerce').astype('Int64')
+    dnb_raw['query_type'] = dnb_raw['query_type'].astype('category')
+
+    logger.info(f"📂 Daten geladen:")
+    logger.info(f"   VDEH: {len(vdeh):,}")
+    logger.info(f"   DNB Raw (gefunden): {len(dnb_raw):,}")
+    logger.info(f"   DNB Title/Author (gefunden): {len(dnb_ta):,}")
+    logger.info(f"   DNB Title/Year (gefunden): {len(dnb_ty):,}")
+
+    # Join-Schlüssel einmalig über alle vier Tabellen als int32 kodieren
+    vdeh_codes, raw_codes, ta_codes, ty_codes = factorize_ids(
+        [vdeh, dnb_raw, dnb_ta, dnb_ty],
+        ['id', 'vdeh_id', 'vdeh_id', 'vdeh_id']
     )
-    if 'vdeh_id' in df_enriched.columns:
-        df_enriched.drop(columns=['vdeh_id'], inplace=True)
-
-    logger.info(f"✅ Title/Author DNB-Daten gemerged")
-
-    # Merge Title/Year data
-    dnb_ty_matches = dnb_ty[dnb_ty['dnb_found'] == True][cols_ta].copy()
-    dnb_ty_matches = dnb_ty_matches.rename(columns={
-        'dnb_title': 'dnb_title_ty',
-        'dnb_authors': 'dnb_authors_ty',
-        'dnb_year': 'dnb_year_ty',
-        'dnb_publisher': 'dnb_publisher_ty',
-        'dnb_isbn': 'dnb_isbn_ty',
-        'dnb_issn': 'dnb_issn_ty',
-        'dnb_pages': 'dnb_pages_ty'
-    })
 
-    df_enriched = df_enriched.merge(
-        dnb_ty_matches,
-        left_on='id',
-        right_on='vdeh_id',
+    # ISBN/ISSN-based DNB data; Spalten, die VDEH bereits hat, behalten den VDEH-Wert
+    dnb_isbn_issn = dnb_raw.drop(columns=['vdeh_id']).rename(columns={'query_type': 'dnb_query_method'})
+    dnb_isbn_issn = dnb_isbn_issn.drop(columns=[c for c in dnb_isbn_issn.columns if c in vdeh.columns])
+    dnb_isbn_issn.index = raw_codes
+
+    # Title/Author und Title/Year data mit Suffix
+    dnb_ta_matches = dnb_ta.drop(columns=['vdeh_id']).add_suffix('_ta')
+    dnb_ta_matches.index = ta_codes
+    dnb_ty_matches = dnb_ty.drop(columns=['vdeh_id']).add_suffix('_ty')
+    dnb_ty_matches.index = ty_codes
+
+    # Ein Join über den Index statt drei aufeinanderfolgender Merges
+    df_enriched = vdeh.set_index(pd.Index(vdeh_codes)).join(
+        [dnb_isbn_issn, dnb_ta_matches, dnb_ty_matches],
         how='left'
-    )
-    if 'vdeh_id' in df_enriched.columns:
-        df_enriched.drop(columns=['vdeh_id'], inplace=True)
+    ).reset_index(drop=True)
 
-    logger.info(f"✅ Title/Year DNB-Daten gemerged")
+    logger.info(f"✅ ISBN/ISSN, Title/Author und Title/Year DNB-Daten gemerged")
 
-    # Normalize year columns
-    year_columns = ['year', 'dnb_year', 'dnb_year_ta', 'dnb_year_ty']
-    for col in year_columns:
-        if col in df_enriched.columns:
-            df_enriched[col] = pd.to_numeric(df_enriched[col], errors='coerce').astype('Int64')
+    # Normalize VDEH year column (DNB-Jahre sind bereits Int64)
+    if 'year' in df_enriched.columns:
+        df_enriched['year'] = pd.to_numeric(df_enriched['year'], errors='coerce').astype('Int64')
 
-    # Save
+    # Save: mit Standard-pandas-Typen, damit nachgelagerte pd.read_parquet-Aufrufe
+    # dieselben Typen wie bisher erhalten (keine ArrowDtype-Metadaten in der Datei)
+    df_enriched = to_default_dtypes(df_enriched)
     output_path = data_dir / '04_dnb_enriched_data.parquet'
-    df_enriched.to_parquet(output_path, index=False)
+    df_enriched.to_parquet(output_path, index=False, engine='pyarrow')
     logger.info(f"💾 DNB-angereicherte Daten gespeichert: {output_path.name}")
     logger.info(f"   Records: {len(df_enriched):,}")
 
@@ -354,6 +475,15 @@ def regenerate_statistics(project_root: Path):
 
 def main():
     """Hauptfunktion für den kompletten Fix-Prozess."""
+    parser = argparse.ArgumentParser(description="ISBN Corruption Fix")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="DNB-Cache (data/vdeh/cache/dnb) nicht verwenden")
+    parser.add_argument('--force-refresh', action='store_true',
+                        help="Gecachte DNB-Ergebnisse ignorieren und neu abfragen")
+    parser.add_argument('--refresh-older-than', type=float, metavar='DAYS', default=None,
+                        help="Gecachte DNB-Ergebnisse älter als DAYS Tage neu abfragen")
+    args = parser.parse_args()
+
     logger.info("="*70)
     logger.info("ISBN CORRUPTION FIX - AUTOMATED PIPELINE")
     logger.info("="*70)
@@ -398,10 +528,26 @@ def main():
         create_backup(file_path, backup_dir)
 
     # Fix DNB raw data
-    dnb_fixed, requery_count = fix_dnb_raw_data(data_dir, rate_limit=1.0)
-
-    # Re-run enrichment merge
-    df_enriched = run_enrichment_merge(data_dir)
+    cache = None
+    if not args.no_cache:
+        cache = DNBCache(
+            cache_dir=project_root / 'data' / 'vdeh' / 'cache' / 'dnb',
+            max_age_days=args.refresh_older_than,
+            force_refresh=args.force_refresh
+        )
+    dnb_fixed, requery_count = fix_dnb_raw_data(data_dir, rate_limit=1.0, cache=cache)
+
+    # Re-run enrichment merge (entfällt, wenn nichts neu abgefragt wurde und das Ergebnis aktuell ist)
+    raw_path = data_dir / 'dnb_raw_data.parquet'
+    enriched_path = data_dir / '04_dnb_enriched_data.parquet'
+    if (
+        requery_count > 0
+        or not enriched_path.exists()
+        or raw_path.stat().st_mtime > enriched_path.stat().st_mtime
+    ):
+        run_enrichment_merge(data_dir)
+    else:
+        logger.info(f"⏭️  Enrichment Merge übersprungen: keine Neuabfragen, {enriched_path.name} ist aktuell")
 
     # Summary
     elapsed = time.time() - start_time
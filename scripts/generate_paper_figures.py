@@ -14,42 +14,13 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import re
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'src'))
 
-
-def extract_page_number(pages_str):
-    """
-    Extract numeric page count from various page string formats.
-
-    Handles common formats:
-    - "188 S." -> 188
-    - "XV, 250 p." -> 250 (ignores Roman numerals)
-    - "192 pages" -> 192
-    """
-    if pd.isna(pages_str) or not pages_str:
-        return None
-
-    pages_str = str(pages_str).strip()
-
-    patterns = [
-        r'(\d+)\s*(?:S\.|p\.|pages?|Seiten?)',
-        r'(\d+)\s*$',
-        r'(\d+)\s*[,:]',
-    ]
-
-    numbers = []
-    for pattern in patterns:
-        matches = re.findall(pattern, pages_str, re.IGNORECASE)
-        numbers.extend([int(m) for m in matches])
-
-    if not numbers:
-        return None
-
-    return max(numbers)
+from fusion.utils import extract_page_number_series
 
 
 def generate_pages_histogram(fused_df: pd.DataFrame, output_dir: Path) -> dict:
@@ -63,10 +34,11 @@ def generate_pages_histogram(fused_df: pd.DataFrame, output_dir: Path) -> dict:
 
     # Extract numeric page counts
     fused_df = fused_df.copy()
-    fused_df['pages_num'] = fused_df['pages'].apply(extract_page_number)
+    fused_df['pages_num'] = extract_page_number_series(fused_df['pages'])
 
-    # Filter valid page counts
-    valid_pages = fused_df['pages_num'].dropna()
+    # Filter valid page counts (einmal als NumPy-Array materialisiert)
+    valid_pages = fused_df['pages_num'].dropna().to_numpy(dtype=np.float64)
+    q25, median, q75 = np.percentile(valid_pages, [25, 50, 75])
 
     stats = {
         'total_records': len(fused_df),
@@ -75,10 +47,10 @@ def generate_pages_histogram(fused_df: pd.DataFrame, output_dir: Path) -> dict:
         'min': int(valid_pages.min()),
         'max': int(valid_pages.max()),
         'mean': float(valid_pages.mean()),
-        'median': float(valid_pages.median()),
-        'std': float(valid_pages.std()),
-        'q25': float(valid_pages.quantile(0.25)),
-        'q75': float(valid_pages.quantile(0.75)),
+        'median': float(median),
+        'std': float(valid_pages.std(ddof=1)),
+        'q25': float(q25),
+        'q75': float(q75),
     }
 
     # Create figure - sized for 95% of A4 text width (~16cm -> 15.2cm = 6 inches)
@@ -94,14 +66,16 @@ def generate_pages_histogram(fused_df: pd.DataFrame, output_dir: Path) -> dict:
 
     # Full distribution (capped at 1000 for visibility)
     pages_capped = valid_pages[valid_pages <= 1000]
-    ax.hist(pages_capped, bins=50, edgecolor='black', linewidth=0.3, alpha=0.7, color='steelblue')
+    counts, edges = np.histogram(pages_capped, bins=50)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+           edgecolor='black', linewidth=0.3, alpha=0.7, color='steelblue')
     ax.set_xlabel('Seitenzahl', fontsize=label_fontsize)
     ax.set_ylabel('Anzahl Werke', fontsize=label_fontsize)
     ax.set_title(f'Verteilung der Seitenzahlen (n={len(pages_capped):,} Werke mit max. 1000 Seiten)', fontsize=title_fontsize)
-    ax.axvline(valid_pages.median(), color='red', linestyle='--', linewidth=1.5,
-               label=f'Median: {valid_pages.median():.0f}')
-    ax.axvline(valid_pages.mean(), color='orange', linestyle='--', linewidth=1.5,
-               label=f'Mittelwert: {valid_pages.mean():.0f}')
+    ax.axvline(stats['median'], color='red', linestyle='--', linewidth=1.5,
+               label=f'Median: {stats["median"]:.0f}')
+    ax.axvline(stats['mean'], color='orange', linestyle='--', linewidth=1.5,
+               label=f'Mittelwert: {stats["mean"]:.0f}')
     ax.legend(fontsize=legend_fontsize, loc='upper right')
     ax.tick_params(axis='both', labelsize=tick_fontsize)
     ax.grid(axis='y', alpha=0.3, linewidth=0.5)
@@ -145,7 +119,7 @@ def main():
     print(f"\nOutput-Verzeichnis: {output_dir}")
 
     print("\n1. Lade Daten...")
-    fused_df = pd.read_parquet(data_dir / '06_vdeh_dnb_loc_fused_data.parquet')
+    fused_df = pd.read_parquet(data_dir / '06_vdeh_dnb_loc_fused_data.parquet', dtype_backend='pyarrow')
     print(f"   ✓ Fused: {len(fused_df):,} records")
 
     print("\n2. Generiere Abbildungen...")
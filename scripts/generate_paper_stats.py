@@ -12,49 +12,129 @@ Dieses Script berechnet:
 Output: JSON-Datei mit allen Statistiken für Jinja2-Templates
 """
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
+import pyarrow.parquet as pq
 import json
 import re
+import numpy as np
 from typing import Dict, Any
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Seitenangaben: bevorzugt "<n> S.", sonst erste Zahl
+_PAGES_RE_S = re.compile(r'\b(\d+)\s*S\.')
+_PAGES_RE_NUM = re.compile(r'(\d+)')
+
+# Eingabedateien je Analyse-Stage (comparison_v1/v2 hängen zusätzlich von avg_pages aus den
+# VDEh-Daten bzw. von comparison_v1 ab - beide über dieselben Eingaben abgedeckt)
+STAGE_INPUTS = {
+    'vdeh_quality': ['vdeh'],
+    'comparison_v1': ['vdeh', 'matches', 'fused'],
+    'enrichment': ['vdeh', 'dnb', 'loc', 'fused'],
+    'comparison_v2': ['vdeh', 'matches', 'fused'],
+    'ub_freiberg_quality': ['ub'],
+}
+
+# Spalten je Quelle und Feldgruppe; Suffixe '', '_ta', '_ty' = ISBN/ISSN-, Titel/Autor-, Titel/Jahr-Abfrage
+_QUERY_METHODS = ('', '_ta', '_ty')
+ENRICHMENT_FIELD_COLUMNS = {
+    prefix: {
+        **{
+            field: [f'{prefix}_{field}{method}' for method in _QUERY_METHODS]
+            for field in ('title', 'authors', 'year', 'isbn', 'issn')
+        },
+        'pages': [f'{prefix}_pages{method}_num' for method in _QUERY_METHODS]
+    }
+    for prefix in ('dnb', 'loc')
+}
+
 
 def extract_pages(page_str):
     """Extract numeric page count from MAB2 pages field."""
     if pd.isna(page_str):
         return None
-    match = re.search(r'\b(\d+)\s*S\.', str(page_str))
+    match = _PAGES_RE_S.search(str(page_str))
     if match:
         return int(match.group(1))
-    match = re.search(r'(\d+)', str(page_str))
+    match = _PAGES_RE_NUM.search(str(page_str))
     if match:
         return int(match.group(1))
     return None
 
 
-def analyze_vdeh_quality(vdeh_df: pd.DataFrame) -> Dict[str, Any]:
-    """Analysiert VDEh Datenqualität."""
+def extract_pages_series(pages: pd.Series) -> pd.Series:
+    """Vektorisierte Variante von extract_pages für eine ganze Spalte (float, NaN = keine Angabe)."""
+    pages = pages.astype('string')
+    primary = pages.str.extract(_PAGES_RE_S.pattern, expand=False)
+    fallback = pages.str.extract(_PAGES_RE_NUM.pattern, expand=False)
+    return pd.to_numeric(primary.fillna(fallback), errors='coerce').astype('float64')
+
+
+def add_pages_num(dfs: Dict[str, pd.DataFrame]) -> None:
+    """
+    Extrahiert die Seitenzahlen einmalig als *_num Spalten (in-place) für alle Analysen.
+
+    Args:
+        dfs: Geladene DataFrames nach Name ('vdeh', 'dnb', 'loc', 'fused', ...); fehlende werden übersprungen
+    """
+    for name in ('vdeh', 'fused'):
+        if name in dfs:
+            dfs[name]['pages_num'] = extract_pages_series(dfs[name]['pages'])
+
+    # DNB/LoC: alle Abfragemethoden (ISBN/ISSN, Titel/Autor, Titel/Jahr)
+    for prefix in ('dnb', 'loc'):
+        if prefix not in dfs:
+            continue
+        df = dfs[prefix]
+        for col in [f'{prefix}_pages{method}' for method in _QUERY_METHODS]:
+            if col in df.columns:
+                df[col + '_num'] = extract_pages_series(df[col])
+
+
+def stage_fingerprint(paths: list) -> Dict[str, list]:
+    """Fingerabdruck einer Analyse-Stage: mtime/Größe der Eingabedateien und dieses Scripts."""
+    fingerprint = {}
+    for path in [Path(__file__), *paths]:
+        stat = path.stat()
+        fingerprint[path.name] = [stat.st_mtime_ns, stat.st_size]
+    return fingerprint
+
+
+def read_parquet_columns(path: Path, columns: list) -> pd.DataFrame:
+    """Liest nur die angegebenen Spalten einer Parquet-Datei (fehlende Spalten werden übersprungen)."""
+    available = set(pq.read_schema(path).names)
+    return pd.read_parquet(path, columns=[c for c in columns if c in available])
 
-    # Extract pages
-    vdeh_df['pages_num'] = vdeh_df['pages'].apply(extract_pages)
+
+def observed_value_counts(series: pd.Series) -> pd.Series:
+    """value_counts ohne nicht vorkommende Kategorien (category-dtype zählt sonst auch 0er)."""
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def analyze_vdeh_quality(vdeh_df: pd.DataFrame) -> Dict[str, Any]:
+    """Analysiert VDEh Datenqualität (erwartet die Spalte pages_num, siehe add_pages_num)."""
 
     total = len(vdeh_df)
 
-    # Basic completeness
-    title_count = vdeh_df['title'].notna().sum()
-    authors_count = vdeh_df['authors_str'].notna().sum()
-    year_count = vdeh_df['year'].notna().sum()
-    isbn_count = vdeh_df['isbn'].notna().sum()
-    issn_count = vdeh_df['issn'].notna().sum()
-    pages_count = vdeh_df['pages_num'].notna().sum()
-
-    # Pages statistics
-    total_pages = int(vdeh_df['pages_num'].sum(skipna=True))
+    # Basic completeness (Nicht-Null-Zählung aller Felder in einem count()-Aufruf)
+    counts = vdeh_df[['title', 'authors_str', 'year', 'isbn', 'issn']].count()
+    title_count = counts['title']
+    authors_count = counts['authors_str']
+    year_count = counts['year']
+    isbn_count = counts['isbn']
+    issn_count = counts['issn']
+
+    # Pages statistics direkt auf dem float64-Array (NaN = keine Seitenangabe)
+    pages = vdeh_df['pages_num'].to_numpy(dtype=np.float64, na_value=np.nan)
+    pages_count = int(np.count_nonzero(~np.isnan(pages)))
+    total_pages = int(np.nansum(pages))
     avg_pages = int(total_pages / pages_count) if pages_count > 0 else 0
     estimated_total_pages = total * avg_pages
 
@@ -68,7 +148,7 @@ def analyze_vdeh_quality(vdeh_df: pd.DataFrame) -> Dict[str, Any]:
     }
 
     top_languages = []
-    for lang, count in vdeh_df['detected_language'].value_counts().head(5).items():
+    for lang, count in observed_value_counts(vdeh_df['detected_language']).head(5).items():
         top_languages.append((
             lang,
             {
@@ -123,12 +203,10 @@ def analyze_comparison_v1(vdeh_df: pd.DataFrame, matches_df: pd.DataFrame,
     """Analysiert ersten UB-Abgleich (nur VDEh-Daten)."""
 
     # Filter to VDEh-only matches
-    vdeh_indices_set = set(matches_df['vdeh_index'].values)
-    matched_sources = fused_df.loc[list(vdeh_indices_set), 'title_source']
-    vdeh_only_mask = matched_sources == 'vdeh'
-    vdeh_only_indices = matched_sources[vdeh_only_mask].index.tolist()
+    unique_idx = matches_df['vdeh_index'].unique()
+    source_counts = observed_value_counts(fused_df['title_source'].reindex(unique_idx))
 
-    total_matches = len(vdeh_only_indices)
+    total_matches = int(source_counts.get('vdeh', 0))
     total = len(vdeh_df)
 
     # Books to digitize
@@ -146,125 +224,104 @@ def analyze_comparison_v1(vdeh_df: pd.DataFrame, matches_df: pd.DataFrame,
 
 def analyze_enrichment(vdeh_df: pd.DataFrame, dnb_df: pd.DataFrame,
                        loc_df: pd.DataFrame, fused_df: pd.DataFrame) -> Dict[str, Any]:
-    """Analysiert DNB/LoC Anreicherung."""
+    """Analysiert DNB/LoC Anreicherung (erwartet die *_num Seitenspalten, siehe add_pages_num)."""
 
     total = len(vdeh_df)
 
+    def align_to_vdeh(df: pd.DataFrame, name: str) -> pd.DataFrame:
+        """Richtet df am VDEh-Index aus, da die Bitmaps unten positionsweise verknüpft werden."""
+        if df.index.equals(vdeh_df.index):
+            return df
+        if not (df.index.is_unique and vdeh_df.index.is_unique):
+            raise ValueError(f"{name}: Index nicht eindeutig, keine Ausrichtung an VDEh möglich")
+        print(f"   ⚠️  {name}: Index/Reihenfolge weicht von VDEh ab ({len(df):,} vs. {total:,} Zeilen), richte aus")
+        return df.reindex(vdeh_df.index)
+
+    dnb_df = align_to_vdeh(dnb_df, 'DNB')
+    loc_df = align_to_vdeh(loc_df, 'LoC')
+    fused_df = align_to_vdeh(fused_df, 'Fused')
+
+    def any_notna(df: pd.DataFrame, cols: list) -> np.ndarray:
+        """Bool-Array: mindestens eine der (vorhandenen) Spalten ist gefüllt."""
+        # Spaltenweise in ein ndarray OR-verknüpfen: kein Bool-DataFrame und keine 2D-Kopie.
+        # notna() je Spalte nutzt die Null-Maske direkt; pd.isna(col.to_numpy()) würde
+        # String-/Extension-Spalten erst als Python-Objekte materialisieren.
+        mask = np.zeros(len(df), dtype=bool)
+        for col in cols:
+            if col in df.columns:
+                np.logical_or(mask, df[col].notna().to_numpy(), out=mask)
+        return mask
+
+    # Bitmaps je Quelle und Feldgruppe einmalig berechnen
+    dnb_cols = ENRICHMENT_FIELD_COLUMNS['dnb']
+    loc_cols = ENRICHMENT_FIELD_COLUMNS['loc']
+    has_dnb = {field: any_notna(dnb_df, cols) for field, cols in dnb_cols.items()}
+    has_loc = {field: any_notna(loc_df, cols) for field, cols in loc_cols.items()}
+
     # DNB counts
-    dnb_id_count = dnb_df['dnb_title'].notna().sum()
-    dnb_ta_count = dnb_df['dnb_title_ta'].notna().sum()
-    dnb_ty_count = dnb_df['dnb_title_ty'].notna().sum()
-    dnb_total = dnb_df[['dnb_title', 'dnb_title_ta', 'dnb_title_ty']].notna().any(axis=1).sum()
+    dnb_id_count, dnb_ta_count, dnb_ty_count = dnb_df[dnb_cols['title']].count()
+    dnb_total = np.count_nonzero(has_dnb['title'])
 
     # LoC counts
-    loc_id_count = loc_df['loc_title'].notna().sum()
-    loc_ta_count = loc_df['loc_title_ta'].notna().sum()
-    loc_ty_count = loc_df['loc_title_ty'].notna().sum()
-    loc_total = loc_df[['loc_title', 'loc_title_ta', 'loc_title_ty']].notna().any(axis=1).sum()
+    loc_id_count, loc_ta_count, loc_ty_count = loc_df[loc_cols['title']].count()
+    loc_total = np.count_nonzero(has_loc['title'])
 
     # Combined
-    has_dnb = dnb_df[['dnb_title', 'dnb_title_ta', 'dnb_title_ty']].notna().any(axis=1)
-    has_loc = loc_df[['loc_title', 'loc_title_ta', 'loc_title_ty']].notna().any(axis=1)
-    total_enriched = (has_dnb | has_loc).sum()
-    both_sources = (has_dnb & has_loc).sum()
+    total_enriched = np.count_nonzero(np.logical_or(has_dnb['title'], has_loc['title']))
+    both_sources = np.count_nonzero(np.logical_and(has_dnb['title'], has_loc['title']))
+
+    # VDEh-Lücken und gefüllte Felder nach der Fusion
+    vdeh_missing = {
+        field: vdeh_df[col].isna().to_numpy()
+        for field, col in [('title', 'title'), ('authors', 'authors_str'), ('year', 'year'),
+                           ('isbn', 'isbn'), ('issn', 'issn'), ('pages', 'pages_num')]
+    }
+    fused_filled = {
+        field: fused_df[col].notna().to_numpy()
+        for field, col in [('title', 'title'), ('authors', 'authors'), ('year', 'year'),
+                           ('isbn', 'isbn'), ('issn', 'issn'), ('pages', 'pages_num')]
+    }
 
     # ISBN/ISSN gains
-    isbn_before = vdeh_df['isbn'].notna().sum()
-    isbn_after = fused_df['isbn'].notna().sum()
+    isbn_before = total - np.count_nonzero(vdeh_missing['isbn'])
+    isbn_after = np.count_nonzero(fused_filled['isbn'])
     isbn_gain = isbn_after - isbn_before
 
-    issn_before = vdeh_df['issn'].notna().sum()
-    issn_after = fused_df['issn'].notna().sum()
+    issn_before = total - np.count_nonzero(vdeh_missing['issn'])
+    issn_after = np.count_nonzero(fused_filled['issn'])
     issn_gain = issn_after - issn_before
 
     # Field-level enrichment gains
-    def count_field_gain(vdeh_field: str, fused_field: str, dnb_search: str, loc_search: str,
-                         dnb_df: pd.DataFrame, loc_df: pd.DataFrame,
-                         fused_df: pd.DataFrame, vdeh_df: pd.DataFrame) -> Dict[str, int]:
+    def count_field_gain(field: str) -> Dict[str, int]:
         """Count how many records gained a specific field from DNB, LoC, or fusion."""
-
-        # Records without the field in VDEh
-        vdeh_missing = vdeh_df[vdeh_field].isna()
-
-        # DNB variants for this field
-        dnb_cols = [c for c in dnb_df.columns if c.startswith('dnb_') and dnb_search in c]
-        has_dnb_field = dnb_df[dnb_cols].notna().any(axis=1) if dnb_cols else pd.Series(False, index=dnb_df.index)
-
-        # LoC variants for this field
-        loc_cols = [c for c in loc_df.columns if c.startswith('loc_') and loc_search in c]
-        has_loc_field = loc_df[loc_cols].notna().any(axis=1) if loc_cols else pd.Series(False, index=loc_df.index)
-
-        # Fused field is now filled
-        fused_filled = fused_df[fused_field].notna()
-
-        # Total gain: was missing in VDEh, now filled in fused
-        total_gain = (vdeh_missing & fused_filled).sum()
-
-        # DNB contribution: was missing, DNB has it, fused is filled
-        dnb_gain = (vdeh_missing & has_dnb_field & fused_filled).sum()
-
-        # LoC contribution: was missing, LoC has it, fused is filled
-        loc_gain = (vdeh_missing & has_loc_field & fused_filled).sum()
+        # Was missing in VDEh, now filled in fused (ndarrays, Zeilen per align_to_vdeh ausgerichtet)
+        gained = np.logical_and(vdeh_missing[field], fused_filled[field])
 
         return {
-            'dnb': int(dnb_gain),
-            'loc': int(loc_gain),
-            'total': int(total_gain)
+            'dnb': int(np.count_nonzero(np.logical_and(gained, has_dnb[field]))),
+            'loc': int(np.count_nonzero(np.logical_and(gained, has_loc[field]))),
+            'total': int(np.count_nonzero(gained))
         }
 
-    # Extract pages for counting
-    vdeh_df = vdeh_df.copy()
-    dnb_df = dnb_df.copy()
-    loc_df = loc_df.copy()
-    fused_df = fused_df.copy()
-
-    vdeh_df['pages_num'] = vdeh_df['pages'].apply(extract_pages)
-    fused_df['pages_num'] = fused_df['pages'].apply(extract_pages)
-
-    # For DNB, check all page variants
-    for col in ['dnb_pages', 'dnb_pages_ta', 'dnb_pages_ty']:
-        if col in dnb_df.columns:
-            dnb_df[col + '_num'] = dnb_df[col].apply(extract_pages)
-
-    # For LoC, check all page variants
-    for col in ['loc_pages', 'loc_pages_ta', 'loc_pages_ty']:
-        if col in loc_df.columns:
-            loc_df[col + '_num'] = loc_df[col].apply(extract_pages)
-
     # Calculate gains for each field
-    title_gain = count_field_gain('title', 'title', 'title', 'title', dnb_df, loc_df, fused_df, vdeh_df)
-    authors_gain = count_field_gain('authors_str', 'authors', 'authors', 'authors', dnb_df, loc_df, fused_df, vdeh_df)
-    year_gain = count_field_gain('year', 'year', 'year', 'year', dnb_df, loc_df, fused_df, vdeh_df)
-
-    # ISBN/ISSN with source breakdown
-    vdeh_missing_isbn = vdeh_df['isbn'].isna()
-    has_dnb_isbn = dnb_df[['dnb_isbn', 'dnb_isbn_ta', 'dnb_isbn_ty']].notna().any(axis=1)
-    has_loc_isbn = loc_df[['loc_isbn', 'loc_isbn_ta', 'loc_isbn_ty']].notna().any(axis=1)
-    fused_has_isbn = fused_df['isbn'].notna()
+    title_gain = count_field_gain('title')
+    authors_gain = count_field_gain('authors')
+    year_gain = count_field_gain('year')
 
-    isbn_dnb_gain = (vdeh_missing_isbn & has_dnb_isbn & fused_has_isbn).sum()
-    isbn_loc_gain = (vdeh_missing_isbn & has_loc_isbn & fused_has_isbn).sum()
+    # ISBN/ISSN with source breakdown (total = Netto-Zuwachs)
+    isbn_field_gain = count_field_gain('isbn')
+    isbn_dnb_gain = isbn_field_gain['dnb']
+    isbn_loc_gain = isbn_field_gain['loc']
 
-    vdeh_missing_issn = vdeh_df['issn'].isna()
-    has_dnb_issn = dnb_df[['dnb_issn', 'dnb_issn_ta', 'dnb_issn_ty']].notna().any(axis=1)
-    has_loc_issn = loc_df[['loc_issn', 'loc_issn_ta', 'loc_issn_ty']].notna().any(axis=1)
-    fused_has_issn = fused_df['issn'].notna()
-
-    issn_dnb_gain = (vdeh_missing_issn & has_dnb_issn & fused_has_issn).sum()
-    issn_loc_gain = (vdeh_missing_issn & has_loc_issn & fused_has_issn).sum()
+    issn_field_gain = count_field_gain('issn')
+    issn_dnb_gain = issn_field_gain['dnb']
+    issn_loc_gain = issn_field_gain['loc']
 
     # Pages gain
-    vdeh_missing_pages = vdeh_df['pages_num'].isna()
-    dnb_page_cols = [c for c in dnb_df.columns if c.endswith('_num') and c.startswith('dnb_')]
-    loc_page_cols = [c for c in loc_df.columns if c.endswith('_num') and c.startswith('loc_')]
-
-    has_dnb_pages = dnb_df[dnb_page_cols].notna().any(axis=1) if dnb_page_cols else pd.Series(False, index=dnb_df.index)
-    has_loc_pages = loc_df[loc_page_cols].notna().any(axis=1) if loc_page_cols else pd.Series(False, index=loc_df.index)
-    fused_has_pages = fused_df['pages_num'].notna()
-
-    pages_dnb_gain = (vdeh_missing_pages & has_dnb_pages & fused_has_pages).sum()
-    pages_loc_gain = (vdeh_missing_pages & has_loc_pages & fused_has_pages).sum()
-    pages_total_gain = (vdeh_missing_pages & fused_has_pages).sum()
+    pages_field_gain = count_field_gain('pages')
+    pages_dnb_gain = pages_field_gain['dnb']
+    pages_loc_gain = pages_field_gain['loc']
+    pages_total_gain = pages_field_gain['total']
 
     return {
         'dnb_id_count': int(dnb_id_count),
@@ -330,12 +387,12 @@ def analyze_comparison_v2(matches_df: pd.DataFrame, fused_df: pd.DataFrame,
     fuzzy_matches = (matches_df['match_method'] == 'Title+Author Fuzzy').sum()
 
     # Match sources
-    vdeh_indices_set = set(matches_df['vdeh_index'].values)
-    matched_sources = fused_df.loc[list(vdeh_indices_set), 'title_source']
-    top_sources = [(source, int(count)) for source, count in matched_sources.value_counts().head(5).items()]
+    unique_idx = matches_df['vdeh_index'].unique()
+    source_counts = observed_value_counts(fused_df['title_source'].reindex(unique_idx))
+    top_sources = [(source, int(count)) for source, count in source_counts.head(5).items()]
 
     # Enriched vs original
-    vdeh_only_matches = (matched_sources == 'vdeh').sum()
+    vdeh_only_matches = int(source_counts.get('vdeh', 0))
     enriched_matches = total_matches - vdeh_only_matches
 
     # Digitization
@@ -369,6 +426,11 @@ def analyze_comparison_v2(matches_df: pd.DataFrame, fused_df: pd.DataFrame,
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Paper-Statistiken generieren")
+    parser.add_argument('--force', action='store_true',
+                        help="Alle Analysen neu berechnen (Stage-Cache ignorieren)")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("PAPER STATISTIKEN GENERIERUNG")
     print("=" * 70)
@@ -377,47 +439,115 @@ def main():
     data_dir = project_root / 'data' / 'vdeh' / 'processed'
     ub_data_dir = project_root / 'data' / 'ub_tubaf' / 'processed'
     comparison_dir = project_root / 'data' / 'comparison' / 'matches'
+    output_file = project_root / 'data' / 'processed' / 'paper_statistics.json'
+    cache_file = output_file.parent / 'paper_statistics_stages.json'
+
+    # Je Datei nur die tatsächlich ausgewerteten Spalten lesen (Column Pruning)
+    enrichment_fields = ['title', 'authors', 'year', 'isbn', 'issn', 'pages']
+    read_specs = {
+        'vdeh': (data_dir / '03_language_detected_data.parquet',
+                 ['title', 'authors_str', 'year', 'isbn', 'issn', 'pages', 'detected_language']),
+        'dnb': (data_dir / '04_dnb_enriched_data.parquet',
+                [f'dnb_{field}{method}' for field in enrichment_fields for method in _QUERY_METHODS]),
+        'loc': (data_dir / '04b_loc_enriched_data.parquet',
+                [f'loc_{field}{method}' for field in enrichment_fields for method in _QUERY_METHODS]),
+        'fused': (data_dir / '06_vdeh_dnb_loc_fused_data.parquet',
+                  ['title', 'authors', 'year', 'isbn', 'issn', 'pages', 'title_source']),
+        'matches': (comparison_dir / 'vdeh_ub_matches_fused.parquet', ['vdeh_index', 'match_method']),
+        'ub': (ub_data_dir / '01_loaded_data.parquet', ['isbn']),
+    }
 
-    print("\n1. Lade Daten...")
+    # Stage-Cache: Ergebnisse bleiben gültig, solange sich Eingabedateien und Script nicht ändern
+    cached_stages = {}
+    if cache_file.exists() and not args.force:
+        cached_stages = json.loads(cache_file.read_text(encoding='utf-8'))
 
-    # Load data
-    vdeh_df = pd.read_parquet(data_dir / '03_language_detected_data.parquet')
-    dnb_df = pd.read_parquet(data_dir / '04_dnb_enriched_data.parquet')
-    loc_df = pd.read_parquet(data_dir / '04b_loc_enriched_data.parquet')
-    fused_df = pd.read_parquet(data_dir / '06_vdeh_dnb_loc_fused_data.parquet')
-    matches_df = pd.read_parquet(comparison_dir / 'vdeh_ub_matches_fused.parquet')
-    ub_df = pd.read_parquet(ub_data_dir / '01_loaded_data.parquet')
-
-    print(f"   VDEh: {len(vdeh_df):,} records")
-    print(f"   UB Freiberg: {len(ub_df):,} records")
-    print(f"   Fused: {len(fused_df):,} records")
-    print(f"   Matches: {len(matches_df):,} records")
-
-    print("\n2. Analysiere VDEh Datenqualität...")
-    vdeh_quality = analyze_vdeh_quality(vdeh_df)
+    fingerprints = {
+        stage: stage_fingerprint([read_specs[name][0] for name in inputs])
+        for stage, inputs in STAGE_INPUTS.items()
+    }
+    fresh = {
+        stage: cached_stages[stage]['result']
+        for stage in STAGE_INPUTS
+        if stage in cached_stages and cached_stages[stage]['fingerprint'] == fingerprints[stage]
+    }
+    stale = [stage for stage in STAGE_INPUTS if stage not in fresh]
+    needed = sorted({name for stage in stale for name in STAGE_INPUTS[stage]}, key=list(read_specs).index)
+
+    print("\n1. Lade Daten...")
+    if fresh:
+        print(f"   ↺ Unverändert (aus Stage-Cache): {', '.join(fresh)}")
+
+    # Load data: Parquet-Decoding gibt den GIL frei, daher alle benötigten Dateien parallel lesen
+    dfs = {}
+    if needed:
+        with ThreadPoolExecutor(max_workers=len(needed)) as executor:
+            futures = {
+                name: executor.submit(read_parquet_columns, *read_specs[name])
+                for name in needed
+            }
+            dfs = {name: future.result() for name, future in futures.items()}
+
+    # Wenige, oft wiederholte Werte als Kategorien: value_counts/Vergleiche laufen auf int8-Codes
+    for name, col in [('vdeh', 'detected_language'), ('fused', 'title_source'), ('matches', 'match_method')]:
+        if name in dfs:
+            dfs[name][col] = dfs[name][col].astype('category')
+
+    for name, label in [('vdeh', 'VDEh'), ('ub', 'UB Freiberg'), ('fused', 'Fused'), ('matches', 'Matches')]:
+        if name in dfs:
+            print(f"   {label}: {len(dfs[name]):,} records")
+
+    # Seitenzahlen einmalig extrahieren (VDEh-Qualität und Anreicherung nutzen sie)
+    add_pages_num(dfs)
+
+    stage_results = {}
+
+    def run_stage(stage: str, title: str, compute) -> Dict[str, Any]:
+        """Führt eine Analyse aus oder übernimmt das gecachte Ergebnis."""
+        print(f"\n{title}...")
+        if stage in fresh:
+            print("   ↺ unverändert (Stage-Cache)")
+            result = fresh[stage]
+        else:
+            result = compute()
+        stage_results[stage] = {'fingerprint': fingerprints[stage], 'result': result}
+        return result
+
+    vdeh_quality = run_stage(
+        'vdeh_quality', "2. Analysiere VDEh Datenqualität",
+        lambda: analyze_vdeh_quality(dfs['vdeh'])
+    )
     print(f"   ✓ ISBN-Abdeckung: {vdeh_quality['isbn_coverage_pct']:.1f}%")
     print(f"   ✓ Pages-Abdeckung: {vdeh_quality['pages_coverage_pct']:.1f}%")
     print(f"   ✓ Durchschnitt: {vdeh_quality['avg_pages']} Seiten/Buch")
 
-    print("\n3. Analysiere ersten UB-Abgleich (nur VDEh)...")
-    comparison_v1 = analyze_comparison_v1(vdeh_df, matches_df, fused_df, vdeh_quality['avg_pages'])
+    comparison_v1 = run_stage(
+        'comparison_v1', "3. Analysiere ersten UB-Abgleich (nur VDEh)",
+        lambda: analyze_comparison_v1(dfs['vdeh'], dfs['matches'], dfs['fused'], vdeh_quality['avg_pages'])
+    )
     print(f"   ✓ Matches: {comparison_v1['total_matches']:,} ({comparison_v1['match_rate_pct']:.2f}%)")
     print(f"   ✓ Zu digitalisieren: {comparison_v1['pages_to_scan']:,} Seiten")
 
-    print("\n4. Analysiere DNB/LoC Anreicherung...")
-    enrichment = analyze_enrichment(vdeh_df, dnb_df, loc_df, fused_df)
+    enrichment = run_stage(
+        'enrichment', "4. Analysiere DNB/LoC Anreicherung",
+        lambda: analyze_enrichment(dfs['vdeh'], dfs['dnb'], dfs['loc'], dfs['fused'])
+    )
     print(f"   ✓ DNB: {enrichment['dnb_total']:,} ({enrichment['dnb_coverage_pct']:.1f}%)")
     print(f"   ✓ LoC: {enrichment['loc_total']:,} ({enrichment['loc_coverage_pct']:.1f}%)")
     print(f"   ✓ ISBN-Gewinn: +{enrichment['isbn_gain']} (+{enrichment['isbn_gain_pct']:.1f}%)")
 
-    print("\n5. Analysiere verbesserten UB-Abgleich (mit DNB/LoC)...")
-    comparison_v2 = analyze_comparison_v2(matches_df, fused_df, vdeh_quality['avg_pages'], comparison_v1)
+    comparison_v2 = run_stage(
+        'comparison_v2', "5. Analysiere verbesserten UB-Abgleich (mit DNB/LoC)",
+        lambda: analyze_comparison_v2(dfs['matches'], dfs['fused'], vdeh_quality['avg_pages'], comparison_v1)
+    )
     print(f"   ✓ Matches: {comparison_v2['total_matches']:,} ({comparison_v2['match_rate_pct']:.2f}%)")
     print(f"   ✓ Gewinn: +{comparison_v2['gain_vs_v1']:,} (+{comparison_v2['gain_pct']}%)")
     print(f"   ✓ Seiteneinsparung: -{comparison_v2['pages_saved']:,} Seiten")
 
-    print("\n6. Analysiere UB Freiberg Katalog...")
-    ub_freiberg_quality = analyze_ub_freiberg_quality(ub_df)
+    ub_freiberg_quality = run_stage(
+        'ub_freiberg_quality', "6. Analysiere UB Freiberg Katalog",
+        lambda: analyze_ub_freiberg_quality(dfs['ub'])
+    )
     print(f"   ✓ Total Records: {ub_freiberg_quality['total_records']:,}")
     print(f"   ✓ ISBN-Abdeckung: {ub_freiberg_quality['isbn_coverage_pct']:.1f}%")
 
@@ -435,12 +565,11 @@ def main():
     }
 
     # Save to JSON
-    output_file = project_root / 'data' / 'processed' / 'paper_statistics.json'
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     print(f"\n7. Speichere Statistiken...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    output_file.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding='utf-8')
+    cache_file.write_text(json.dumps(stage_results, ensure_ascii=False), encoding='utf-8')
 
     print(f"   ✓ Gespeichert: {output_file}")
 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the DNB SRU client (without network access).
+
+SRU responses are served by a fake HTTP session, so the tests check how
+query_dnb_by_isbns_bulk maps batch results back to the requested ISBNs.
+The title normalization check compares the vectorized column variant with
+the per-title function used in the title queries.
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dnb_api import query_dnb_by_isbns_bulk, normalize_for_search_batch, _normalize_for_search
+
+SRU_RESPONSE = (
+    '<srw:searchRetrieveResponse xmlns:srw="http://www.loc.gov/zing/srw/">'
+    '<srw:numberOfRecords>{total}</srw:numberOfRecords><srw:records>{records}</srw:records>'
+    '</srw:searchRetrieveResponse>'
+)
+MARC_RECORD = (
+    '<srw:record><srw:recordData>'
+    '<marc:record xmlns:marc="http://www.loc.gov/MARC21/slim">'
+    '<marc:datafield tag="245"><marc:subfield code="a">{title}</marc:subfield></marc:datafield>'
+    '{isbn_fields}'
+    '</marc:record></srw:recordData></srw:record>'
+)
+ISBN_FIELD = '<marc:datafield tag="020"><marc:subfield code="{code}">{isbn}</marc:subfield></marc:datafield>'
+
+
+def _sru(*records, total=None):
+    """SRU response body; records are (title, [(subfield code, isbn), ...]) tuples."""
+    body = ''.join(
+        MARC_RECORD.format(
+            title=title,
+            isbn_fields=''.join(ISBN_FIELD.format(code=code, isbn=isbn) for code, isbn in isbns)
+        )
+        for title, isbns in records
+    )
+    return SRU_RESPONSE.format(total=len(records) if total is None else total, records=body).encode()
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+
+class _FakeSession:
+    """Answers each SRU query from a dict {query: response body}."""
+
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.queries = []
+
+    def get(self, url, params=None, timeout=None):
+        self.queries.append(params['query'])
+        return _Response(self.responses.get(params['query'], _sru()))
+
+
+def test_bulk_matches_cancelled_isbn():
+    """A record found via 020$z (invalid/cancelled ISBN) is assigned to the requested ISBN."""
+    session = _FakeSession({
+        'isbn=9783161484100 or isbn=9780000000002': _sru(
+            ('Stahl im Hochbau', [('a', '9783514007123'), ('z', '9783161484100')])
+        ),
+    })
+
+    results = query_dnb_by_isbns_bulk(['978-3-16-148410-0', '978-0-00-000000-2'], session=session)
+
+    assert results['978-3-16-148410-0']['title'] == 'Stahl im Hochbau', "❌ FAIL: 020$z match lost"
+    assert results['978-0-00-000000-2'] is None, "❌ FAIL: ISBN without hit should be None"
+    assert len(session.queries) == 1, "❌ FAIL: no single queries expected"
+    print("   ✅ PASS: 020$z match assigned, one SRU request")
+
+
+def test_bulk_unassigned_record_falls_back_to_single_queries():
+    """If a returned record matches no requested ISBN, unmatched ISBNs are not reported as missing."""
+    session = _FakeSession({
+        'isbn=9783161484100 or isbn=9780000000002': _sru(
+            ('Werkstoffkunde', [('a', '9781111111113')])
+        ),
+        'isbn=9783161484100': _sru(('Werkstoffkunde', [('a', '9781111111113')])),
+    })
+
+    results = query_dnb_by_isbns_bulk(['978-3-16-148410-0', '978-0-00-000000-2'], session=session)
+
+    assert results['978-3-16-148410-0']['title'] == 'Werkstoffkunde', "❌ FAIL: single query result missing"
+    assert results['978-0-00-000000-2'] is None, "❌ FAIL: single query found nothing"
+    assert session.queries[1:] == ['isbn=9783161484100', 'isbn=9780000000002'], \
+        "❌ FAIL: unmatched ISBNs should be queried singly"
+    print("   ✅ PASS: unassigned record triggers single-query fallback")
+
+
+def test_normalize_for_search_batch_matches_scalar():
+    """The vectorized title normalization agrees with _normalize_for_search."""
+    titles = [
+        "Über die Prüfung von Stählen",      # umlauts
+        "C++ Programmierung",                 # special characters
+        "  Stahl-  und   Eisen: 2. Aufl. ",   # punctuation and whitespace
+        "Straße, naïve café",                 # ß and accents
+        "日本語 Titel",                        # non-ASCII without decomposition
+        "",
+        None,
+    ]
+    expected = [_normalize_for_search(title) for title in titles]
+
+    for dtype in [object, 'string', pd.ArrowDtype(pa.string())]:
+        result = normalize_for_search_batch(pd.Series(titles, dtype=dtype)).tolist()
+        assert result == expected, f"❌ FAIL: batch != scalar for dtype {dtype}: {result}"
+    print("   ✅ PASS: batch normalization == scalar (object, string, Arrow strings)")
+
+
+if __name__ == '__main__':
+    print("🧪 Testing DNB SRU client\n")
+    test_bulk_matches_cancelled_isbn()
+    test_bulk_unassigned_record_falls_back_to_single_queries()
+    test_normalize_for_search_batch_matches_scalar()
+    print("\n✅ All tests passed!")
@@ -7,12 +7,14 @@ import sys
 from pathlib import Path
 import pandas as pd
 import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add src to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-from fusion import FusionEngine, OllamaClient
+from fusion import FusionEngine, CachedOllamaClient
 
 def main():
 
@@ -23,11 +25,12 @@ def main():
 
     print(f"Loaded {len(df_test)} test records\n")
 
-    # Initialize Ollama client
-    ollama_client = OllamaClient(
+    # Initialize Ollama client (responses cached on disk for re-runs)
+    ollama_client = CachedOllamaClient(
         api_url="http://localhost:11434/api/generate",
         model="llama3.3:70b",
-        timeout_sec=220
+        timeout_sec=220,
+        cache_dir=project_root / 'data' / 'vdeh' / 'test' / '.ollama_cache'
     )
 
     # Initialize FusionEngine
@@ -39,6 +42,17 @@ def main():
     # Test with 5 records
     test_records = [6652, 26374, 38578, 1590, 2086]
 
+    # Merge all records concurrently (I/O-bound: waiting on Ollama)
+    with ThreadPoolExecutor(max_workers=len(test_records)) as executor:
+        futures = {executor.submit(engine.merge_record, df_test.loc[idx]): idx for idx in test_records}
+        outcomes = {}
+        for future in as_completed(futures):
+            try:
+                outcomes[futures[future]] = (future.result(), None)
+            except Exception as e:
+                outcomes[futures[future]] = (None, e)
+
+    # Report in the original record order
     results = []
     for idx in test_records:
         print(f"\n{'='*80}")
@@ -50,9 +64,11 @@ def main():
         # Show VDEh data
         print(f"\nVDEh: {row.get('title', 'N/A')[:60]}... ({row.get('year', 'N/A')}) | Lang: {row.get('detected_language', 'N/A')}")
 
-        # Merge record
+        # Merge result
+        result, error = outcomes[idx]
         try:
-            result = engine.merge_record(row)
+            if error is not None:
+                raise error
 
             print(f"\n✅ SUCCESS")
             print(f"   Title source: {result.title_source}")
@@ -81,8 +97,7 @@ def main():
 
         except Exception as e:
             print(f"\n❌ ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            traceback.print_exception(e)
 
             results.append({
                 'index': idx,
@@ -99,6 +114,7 @@ def main():
 
     success_count = sum(1 for r in results if r.get('success', False))
     print(f"Passed: {success_count}/{len(results)} ({success_count/len(results)*100:.1f}%)")
+    print(f"LLM cache: {ollama_client.hits} hits, {ollama_client.misses} misses")
 
     if success_count < len(results):
         print(f"\nFailed tests:")
@@ -7,6 +7,7 @@ to ensure ISBN/ISSN fields are properly extracted and fused.
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 # Add src to path
@@ -15,6 +16,10 @@ sys.path.insert(0, str(project_root / 'src'))
 
 from config_loader import VDEhConfig
 from fusion import FusionEngine, OllamaClient
+from fusion.utils import calculate_pages_match, calculate_pages_match_series
+
+# VDEh columns read by FusionEngine.merge_record
+VDEH_NEEDED = ['isbn', 'issn', 'title', 'authors_str', 'year', 'publisher', 'pages', 'detected_language']
 
 def main():
     print("=" * 80)
@@ -31,17 +36,6 @@ def main():
     # Load merged data (VDEh + DNB + LoC)
     print("\n📂 Loading data...")
 
-    df_vdeh = pd.read_parquet(processed_dir / '03_language_detected_data.parquet')
-    df_dnb = pd.read_parquet(processed_dir / '04_dnb_enriched_data.parquet')
-    df_loc = pd.read_parquet(processed_dir / '04b_loc_enriched_data.parquet')
-
-    print(f"   VDEh: {len(df_vdeh):,} records")
-    print(f"   DNB:  {len(df_dnb):,} records")
-    print(f"   LoC:  {len(df_loc):,} records")
-
-    # Merge sources
-    df_merged = df_vdeh.copy()
-
     # DNB columns
     dnb_cols = [
         'dnb_title', 'dnb_authors', 'dnb_year', 'dnb_publisher', 'dnb_isbn', 'dnb_issn',
@@ -58,46 +52,63 @@ def main():
         'loc_query_method'
     ]
 
-    df_merged = df_merged.join(df_dnb[dnb_cols], how='left')
-    df_merged = df_merged.join(df_loc[loc_cols], how='left')
+    # Only the columns that are actually used are read (column projection)
+    df_vdeh = pd.read_parquet(processed_dir / '03_language_detected_data.parquet',
+                              columns=VDEH_NEEDED, engine='pyarrow', dtype_backend='pyarrow')
+    df_dnb = pd.read_parquet(processed_dir / '04_dnb_enriched_data.parquet',
+                             columns=dnb_cols, engine='pyarrow', dtype_backend='pyarrow')
+    df_loc = pd.read_parquet(processed_dir / '04b_loc_enriched_data.parquet',
+                             columns=loc_cols, engine='pyarrow', dtype_backend='pyarrow')
+
+    print(f"   VDEh: {len(df_vdeh):,} records")
+    print(f"   DNB:  {len(df_dnb):,} records")
+    print(f"   LoC:  {len(df_loc):,} records")
+
+    # Merge sources
+    df_merged = df_vdeh.join(df_dnb, how='left').join(df_loc, how='left')
 
     print(f"\n✅ Data merged: {len(df_merged):,} records, {len(df_merged.columns)} columns")
 
+    # ISBN availability masks (computed once, reused for the sample selection)
+    v_isbn = df_merged['isbn'].notna().to_numpy(dtype=bool)
+    d_isbn = df_merged['dnb_isbn'].notna().to_numpy(dtype=bool)
+    l_isbn = df_merged['loc_isbn'].notna().to_numpy(dtype=bool)
+    d_isbn_ta = df_merged['dnb_isbn_ta'].notna().to_numpy(dtype=bool)
+
     # Check ISBN availability
     print(f"\n📊 ISBN/ISSN Availability:")
-    print(f"   VDEh ISBN:    {df_merged['isbn'].notna().sum():,} ({df_merged['isbn'].notna().sum()/len(df_merged)*100:.1f}%)")
-    print(f"   DNB ISBN (ID):{df_merged['dnb_isbn'].notna().sum():,} ({df_merged['dnb_isbn'].notna().sum()/len(df_merged)*100:.1f}%)")
-    print(f"   DNB ISBN (TA):{df_merged['dnb_isbn_ta'].notna().sum():,} ({df_merged['dnb_isbn_ta'].notna().sum()/len(df_merged)*100:.1f}%)")
-    print(f"   LoC ISBN (ID):{df_merged['loc_isbn'].notna().sum():,} ({df_merged['loc_isbn'].notna().sum()/len(df_merged)*100:.1f}%)")
+    print(f"   VDEh ISBN:    {v_isbn.sum():,} ({v_isbn.mean()*100:.1f}%)")
+    print(f"   DNB ISBN (ID):{d_isbn.sum():,} ({d_isbn.mean()*100:.1f}%)")
+    print(f"   DNB ISBN (TA):{d_isbn_ta.sum():,} ({d_isbn_ta.mean()*100:.1f}%)")
+    print(f"   LoC ISBN (ID):{l_isbn.sum():,} ({l_isbn.mean()*100:.1f}%)")
 
     # Select test sample: records with ISBN from different sources
     print(f"\n🔬 Selecting test sample...")
 
-    # Sample 1: VDEh with ISBN (no enrichment)
-    sample1 = df_merged[
-        (df_merged['isbn'].notna()) &
-        (df_merged['dnb_isbn'].isna()) &
-        (df_merged['loc_isbn'].isna())
-    ].head(2)
-
-    # Sample 2: VDEh + DNB ISBN
-    sample2 = df_merged[
-        (df_merged['isbn'].notna()) &
-        (df_merged['dnb_isbn'].notna())
-    ].head(2)
-
-    # Sample 3: DNB ISBN only
-    sample3 = df_merged[
-        (df_merged['isbn'].isna()) &
-        (df_merged['dnb_isbn'].notna())
-    ].head(2)
-
-    # Sample 4: LoC ISBN
-    sample4 = df_merged[
-        (df_merged['loc_isbn'].notna())
-    ].head(2)
-
-    test_sample = pd.concat([sample1, sample2, sample3, sample4])
+    sample_positions = np.concatenate([
+        np.flatnonzero(v_isbn & ~d_isbn & ~l_isbn)[:2],  # Sample 1: VDEh with ISBN (no enrichment)
+        np.flatnonzero(v_isbn & d_isbn)[:2],             # Sample 2: VDEh + DNB ISBN
+        np.flatnonzero(~v_isbn & d_isbn)[:2],            # Sample 3: DNB ISBN only
+        np.flatnonzero(l_isbn)[:2],                      # Sample 4: LoC ISBN
+    ])
+
+    # Pages validation: vectorized check must agree with the per-record check
+    print(f"\n📏 Checking vectorized pages match (VDEh vs LoC)...")
+    both_pages = df_merged['pages'].notna() & df_merged['loc_pages'].notna()
+    pages1 = df_merged.loc[both_pages, 'pages']
+    pages2 = df_merged.loc[both_pages, 'loc_pages']
+    matches, diffs = calculate_pages_match_series(pages1, pages2)
+    scalar = [calculate_pages_match(p1, p2) for p1, p2 in zip(pages1, pages2)]
+    scalar_matches = np.array([m for m, _ in scalar], dtype=bool)
+    scalar_diffs = np.array([np.nan if d is None else d for _, d in scalar], dtype='float64')
+    assert np.array_equal(matches, scalar_matches), "pages match: vectorized != scalar"
+    assert np.allclose(diffs, scalar_diffs, equal_nan=True), "pages diff: vectorized != scalar"
+    print(f"   ✅ {len(pages1):,} record pairs, {matches.sum():,} matching "
+          f"(vectorized == scalar)")
+
+    test_sample = df_merged.iloc[sample_positions]
+    # Arrow-backed missing values (pd.NA) as None, like the fusion engine expects
+    test_sample = test_sample.astype(object).where(test_sample.notna(), None)
     print(f"   Test sample: {len(test_sample)} records")
 
     # Initialize Ollama (not needed for simple cases, but we need the engine)
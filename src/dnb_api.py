@@ -2,14 +2,23 @@
 DNB API Client für bibliografische Metadaten-Abfragen.
 
 Deutsche Nationalbibliothek SRU API Client mit ISBN/ISSN-basierter Suche.
-Inkl. automatischer Retry-Logik mit Exponential Backoff.
+Inkl. automatischer Retry-Logik mit Exponential Backoff und adaptiver
+Ratenbegrenzung (AIMD) bei HTTP 429. Der (optionale) Limiter wird pro
+HTTP-Anfrage angewendet.
 """
 
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
-from typing import Dict, Optional, Callable
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Callable, Tuple
 import re
 import logging
+import random
+import threading
 import time
 import unicodedata
 
@@ -17,18 +26,168 @@ import unicodedata
 logger = logging.getLogger(__name__)
 
 
-def _retry_with_backoff(func: Callable, max_retries: int = 3, base_delay: float = 2.0, query_desc: str = "query") -> Optional[Dict]:
+class DNBQueryError(Exception):
+    """Raised when a DNB SRU request fails (non-200 status, network or XML error)."""
+
+
+class DNBRateLimitError(DNBQueryError):
+    """Raised when the DNB SRU endpoint answers with HTTP 429 (Too Many Requests)."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"DNB rate limit erreicht (HTTP 429, Retry-After: {retry_after})")
+        self.retry_after = retry_after
+
+
+class AdaptiveRateLimiter:
+    """
+    Adaptive Ratenbegrenzung (AIMD) für DNB-Anfragen.
+
+    Erfolgreiche Anfragen erhöhen die erlaubte Rate additiv, ein HTTP 429
+    halbiert sie. Eine Instanz kann von mehreren Abfragen (und Threads)
+    gemeinsam genutzt werden.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 5.0,
+        increase: float = 0.05,
+        decrease: float = 0.5
+    ):
+        """
+        Args:
+            rate: Start-Rate in Anfragen pro Sekunde
+            min_rate: Untergrenze der Rate
+            max_rate: Obergrenze der Rate
+            increase: Additive Erhöhung pro erfolgreicher Anfrage
+            decrease: Multiplikativer Faktor bei HTTP 429
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blockiert bis zum nächsten freien Anfrage-Slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self) -> None:
+        """Additive Erhöhung der Rate nach erfolgreicher Anfrage."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self) -> None:
+        """Multiplikative Senkung der Rate nach HTTP 429."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        logger.info(f"DNB rate limit: Rate reduziert auf {self.rate:.2f} Anfragen/s")
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def create_session(pool_maxsize: int = 64) -> requests.Session:
+    """
+    Erzeugt eine HTTP-Session für DNB-Anfragen.
+
+    Die Session hält Verbindungen offen (Keep-Alive, Connection Pooling) und
+    wiederholt Serverfehler (5xx) auf Transportebene. HTTP 429 wird bewusst
+    nicht hier, sondern über DNBRateLimitError/_retry_with_backoff behandelt.
+
+    Args:
+        pool_maxsize: Maximale Anzahl offener Verbindungen pro Host
+
+    Returns:
+        requests.Session
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Liefert die gemeinsame HTTP-Session für alle DNB-Anfragen (lazy erzeugt).
+
+    Wird verwendet, wenn den query_dnb_by_* Funktionen keine eigene Session
+    übergeben wird.
+
+    Returns:
+        requests.Session
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session()
+    return _SESSION
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parst einen Retry-After Header (Sekunden oder HTTP-Datum) in Sekunden."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_with_backoff(
+    func: Callable,
+    max_retries: int = 3,
+    base_delay: float = 2.0,
+    query_desc: str = "query",
+    jitter: float = 1.0,
+    raise_on_failure: bool = False
+) -> Optional[Dict]:
     """
     Führt eine Funktion mit Exponential Backoff bei Fehlern aus.
 
+    Jede Exception von func (DNBQueryError bei Nicht-200-Status oder
+    Netzwerkfehler) löst einen erneuten Versuch aus. Bei HTTP 429 wird der
+    Retry-After Header der DNB respektiert. Ein zufälliger Jitter verhindert,
+    dass parallele Abfragen gleichzeitig erneut anfragen. Die Ratenbegrenzung
+    selbst erfolgt pro HTTP-Anfrage in _query_dnb_sru_records().
+
     Args:
         func: Funktion, die ausgeführt werden soll (ohne Parameter)
         max_retries: Maximale Anzahl an Versuchen
         base_delay: Basis-Verzögerung in Sekunden für Backoff
         query_desc: Beschreibung der Query für Logging
+        jitter: Maximaler zufälliger Zuschlag in Sekunden
+        raise_on_failure: Bei dauerhaftem Fehler DNBQueryError auslösen statt None zurückzugeben
 
     Returns:
         Ergebnis der Funktion oder None bei dauerhaftem Fehler
+
+    Raises:
+        DNBQueryError: Bei dauerhaftem Fehler, falls raise_on_failure=True
     """
     last_exception = None
 
@@ -47,14 +206,19 @@ def _retry_with_backoff(func: Callable, max_retries: int = 3, base_delay: float
         except Exception as e:
             last_exception = e
 
+            retry_after = e.retry_after if isinstance(e, DNBRateLimitError) else None
+
             # Letzter Versuch fehlgeschlagen
             if attempt >= max_retries - 1:
                 logger.error(f"Query '{query_desc}' fehlgeschlagen nach {max_retries} Versuchen: {str(e)}")
+                if raise_on_failure:
+                    raise DNBQueryError(f"Query '{query_desc}' fehlgeschlagen nach {max_retries} Versuchen") from e
                 return None
 
-            # Exponential Backoff
-            delay = base_delay * (2 ** attempt)
-            logger.warning(f"Query '{query_desc}' Versuch {attempt + 1}/{max_retries} fehlgeschlagen: {str(e)[:100]}. Retry in {delay}s...")
+            # Retry-After der DNB oder Exponential Backoff, jeweils mit Jitter
+            delay = retry_after if retry_after is not None else base_delay * (2 ** attempt)
+            delay += random.uniform(0, jitter)
+            logger.warning(f"Query '{query_desc}' Versuch {attempt + 1}/{max_retries} fehlgeschlagen: {str(e)[:100]}. Retry in {delay:.1f}s...")
             time.sleep(delay)
 
     return None
@@ -112,134 +276,242 @@ def _normalize_for_search(text: str) -> str:
     return text
 
 
-def _query_dnb_sru(query: str, max_records: int = 1, identifier_type: str = None, identifier_value: str = None) -> Optional[Dict]:
+def normalize_for_search_batch(titles: pd.Series) -> pd.Series:
     """
-    Internal helper to query DNB SRU API and parse MARC21 response.
+    Vektorisierte Variante von _normalize_for_search für eine ganze Spalte.
+
+    Führt dieselben Schritte (NFKD, Nicht-ASCII entfernen, Sonderzeichen durch
+    Leerzeichen ersetzen, Leerzeichen reduzieren) als pandas-String-Operationen
+    aus, statt die Funktion pro Record aufzurufen.
+
+    Args:
+        titles: Series mit Titeln (fehlende Werte werden zu "")
+
+    Returns:
+        Series mit normalisierten Titeln (gleicher Index)
+
+    Example:
+        >>> normalize_for_search_batch(pd.Series(["Über die Prüfung", None])).tolist()
+        ['Uber die Prufung', '']
+    """
+    return (
+        titles.fillna('').astype(str)
+        .str.normalize('NFKD')
+        .str.encode('ascii', 'ignore')
+        .str.decode('ascii')
+        .str.replace(r'[^\w\s]', ' ', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def _query_dnb_sru_records(
+    query: str,
+    max_records: int = 1,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None
+) -> Tuple[list, int]:
+    """
+    Internal helper: führt eine SRU-Anfrage aus und liefert die MARC21-Records.
+
+    Der (optionale) Limiter wird pro HTTP-Anfrage angewendet; nur eine
+    Antwort mit HTTP 200 zählt als Erfolg und erhöht dessen Rate.
 
     Args:
         query: SRU query string
         max_records: Maximum number of records to retrieve
-        identifier_type: Type of identifier ('isbn', 'issn', or None)
-        identifier_value: Value of identifier (cleaned)
+        session: HTTP-Session (default: get_session())
+        limiter: Gemeinsamer AdaptiveRateLimiter (optional)
 
     Returns:
-        Dict with metadata or None on error/not found
+        Tuple aus (Liste der marc:record Elemente (leer = nichts gefunden),
+        Gesamtzahl der Treffer laut srw:numberOfRecords)
+
+    Raises:
+        DNBRateLimitError: Bei HTTP 429
+        DNBQueryError: Bei anderem Status als 200, Netzwerk- oder XML-Fehler
     """
+    params = {
+        'version': '1.1',
+        'operation': 'searchRetrieve',
+        'query': query,
+        'recordSchema': 'MARC21-xml',
+        'maximumRecords': max_records
+    }
+
+    if session is None:
+        session = get_session()
+    if limiter:
+        limiter.wait()
+
     try:
-        params = {
-            'version': '1.1',
-            'operation': 'searchRetrieve',
-            'query': query,
-            'recordSchema': 'MARC21-xml',
-            'maximumRecords': max_records
-        }
+        response = session.get(DNB_SRU_BASE, params=params, timeout=10)
+    except requests.exceptions.RequestException as e:
+        raise DNBQueryError(f"DNB query error for '{query}': {e}") from e
 
-        response = requests.get(DNB_SRU_BASE, params=params, timeout=10)
+    if response.status_code == 429:
+        if limiter:
+            limiter.on_rate_limited()
+        raise DNBRateLimitError(_parse_retry_after(response.headers.get('Retry-After')))
 
-        if response.status_code != 200:
-            return None
+    if response.status_code != 200:
+        raise DNBQueryError(f"DNB query '{query}' failed: HTTP {response.status_code}")
 
-        # Parse XML Response
+    # Parse XML Response
+    try:
         root = ET.fromstring(response.content)
+    except ET.ParseError as e:
+        raise DNBQueryError(f"DNB response for '{query}' is not valid XML: {e}") from e
 
-        # Extract first record
-        record = root.find('.//srw:recordData/marc:record', MARC_NAMESPACES)
-        if record is None:
-            return None
-
-        # Initialize metadata
-        metadata = {
-            'title': None,
-            'authors': [],
-            'year': None,
-            'publisher': None,
-            'isbn': None,
-            'issn': None,
-            'pages': None
-        }
-
-        # Add identifier if provided (from query parameter)
-        if identifier_type and identifier_value:
-            metadata[identifier_type] = identifier_value
-
-        # Parse MARC21 fields
-        for datafield in record.findall('marc:datafield', MARC_NAMESPACES):
-            tag = datafield.get('tag')
-
-            # ISBN (020)
-            if tag == '020' and not metadata.get('isbn'):
-                subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
-                if subfields and subfields[0].text:
-                    # Extract ISBN (may contain additional text like binding info)
-                    isbn_text = subfields[0].text.strip()
-                    # Clean: remove everything after space or parenthesis
-                    isbn_clean = re.split(r'[\s(]', isbn_text)[0]
-                    # Remove hyphens for normalized storage
-                    isbn_clean = isbn_clean.replace('-', '')
-                    # Validate basic ISBN format (10 or 13 digits)
-                    if re.match(r'^\d{10}(\d{3})?$', isbn_clean):
-                        metadata['isbn'] = isbn_clean
-
-            # ISSN (022)
-            elif tag == '022' and not metadata.get('issn'):
-                subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
-                if subfields and subfields[0].text:
-                    issn_text = subfields[0].text.strip()
-                    # Clean: remove everything after space
-                    issn_clean = re.split(r'\s', issn_text)[0]
-                    # Remove hyphens for normalized storage
-                    issn_clean = issn_clean.replace('-', '')
-                    # Validate basic ISSN format (8 digits)
-                    if re.match(r'^\d{7}[\dXx]$', issn_clean):
-                        metadata['issn'] = issn_clean.upper()
-
-            # Title (245)
-            elif tag == '245':
-                subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
-                if subfields:
-                    metadata['title'] = subfields[0].text
-
-            # Authors (100, 700, 110, 710)
-            # 100/700 = Persons, 110/710 = Corporate bodies
-            elif tag in ['100', '700', '110', '710']:
-                subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
-                for sf in subfields:
-                    if sf.text:
-                        author_name = sf.text.strip()
-                        if author_name and author_name not in metadata['authors']:  # Avoid duplicates
-                            metadata['authors'].append(author_name)
-
-            # Year AND Publisher (264 or 260)
-            elif tag in ['264', '260']:
-                # Year from subfield 'c'
-                subfields_year = datafield.findall('marc:subfield[@code="c"]', MARC_NAMESPACES)
-                if subfields_year and subfields_year[0].text:
-                    year_text = subfields_year[0].text
-                    # Extract 4-digit year
-                    year_match = re.search(r'\b(1[89]\d{2}|20\d{2})\b', year_text)
-                    if year_match:
-                        metadata['year'] = int(year_match.group(1))
-
-                # Publisher from subfield 'b'
-                subfields_publisher = datafield.findall('marc:subfield[@code="b"]', MARC_NAMESPACES)
-                if subfields_publisher and subfields_publisher[0].text:
-                    metadata['publisher'] = subfields_publisher[0].text
-
-            # Pages (300 - Physical Description)
-            elif tag == '300':
-                # Pages from subfield 'a' (e.g., "188 S.", "XV, 250 p.")
-                subfields_pages = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
-                if subfields_pages and subfields_pages[0].text:
-                    metadata['pages'] = subfields_pages[0].text.strip()
-
-        return metadata
+    if limiter:
+        limiter.on_success()
 
-    except Exception as e:
-        logger.warning(f"DNB query error for '{query}': {str(e)}")
+    records = root.findall('.//srw:recordData/marc:record', MARC_NAMESPACES)
+    try:
+        total = int(root.findtext('.//srw:numberOfRecords', namespaces=MARC_NAMESPACES))
+    except (TypeError, ValueError):
+        total = len(records)
+    return records, total
+
+
+def _parse_marc_record(record: ET.Element, identifier_type: str = None, identifier_value: str = None) -> Dict:
+    """
+    Internal helper: extrahiert die Metadaten aus einem MARC21-Record.
+
+    Args:
+        record: marc:record Element
+        identifier_type: Type of identifier ('isbn', 'issn', or None)
+        identifier_value: Value of identifier (cleaned)
+
+    Returns:
+        Dict with metadata
+    """
+    # Initialize metadata
+    metadata = {
+        'title': None,
+        'authors': [],
+        'year': None,
+        'publisher': None,
+        'isbn': None,
+        'issn': None,
+        'pages': None
+    }
+
+    # Add identifier if provided (from query parameter)
+    if identifier_type and identifier_value:
+        metadata[identifier_type] = identifier_value
+
+    # Parse MARC21 fields
+    for datafield in record.findall('marc:datafield', MARC_NAMESPACES):
+        tag = datafield.get('tag')
+
+        # ISBN (020)
+        if tag == '020' and not metadata.get('isbn'):
+            subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
+            if subfields and subfields[0].text:
+                # Extract ISBN (may contain additional text like binding info)
+                isbn_text = subfields[0].text.strip()
+                # Clean: remove everything after space or parenthesis
+                isbn_clean = re.split(r'[\s(]', isbn_text)[0]
+                # Remove hyphens for normalized storage
+                isbn_clean = isbn_clean.replace('-', '')
+                # Validate basic ISBN format (10 or 13 digits)
+                if re.match(r'^\d{10}(\d{3})?$', isbn_clean):
+                    metadata['isbn'] = isbn_clean
+
+        # ISSN (022)
+        elif tag == '022' and not metadata.get('issn'):
+            subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
+            if subfields and subfields[0].text:
+                issn_text = subfields[0].text.strip()
+                # Clean: remove everything after space
+                issn_clean = re.split(r'\s', issn_text)[0]
+                # Remove hyphens for normalized storage
+                issn_clean = issn_clean.replace('-', '')
+                # Validate basic ISSN format (8 digits)
+                if re.match(r'^\d{7}[\dXx]$', issn_clean):
+                    metadata['issn'] = issn_clean.upper()
+
+        # Title (245)
+        elif tag == '245':
+            subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
+            if subfields:
+                metadata['title'] = subfields[0].text
+
+        # Authors (100, 700, 110, 710)
+        # 100/700 = Persons, 110/710 = Corporate bodies
+        elif tag in ['100', '700', '110', '710']:
+            subfields = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
+            for sf in subfields:
+                if sf.text:
+                    author_name = sf.text.strip()
+                    if author_name and author_name not in metadata['authors']:  # Avoid duplicates
+                        metadata['authors'].append(author_name)
+
+        # Year AND Publisher (264 or 260)
+        elif tag in ['264', '260']:
+            # Year from subfield 'c'
+            subfields_year = datafield.findall('marc:subfield[@code="c"]', MARC_NAMESPACES)
+            if subfields_year and subfields_year[0].text:
+                year_text = subfields_year[0].text
+                # Extract 4-digit year
+                year_match = re.search(r'\b(1[89]\d{2}|20\d{2})\b', year_text)
+                if year_match:
+                    metadata['year'] = int(year_match.group(1))
+
+            # Publisher from subfield 'b'
+            subfields_publisher = datafield.findall('marc:subfield[@code="b"]', MARC_NAMESPACES)
+            if subfields_publisher and subfields_publisher[0].text:
+                metadata['publisher'] = subfields_publisher[0].text
+
+        # Pages (300 - Physical Description)
+        elif tag == '300':
+            # Pages from subfield 'a' (e.g., "188 S.", "XV, 250 p.")
+            subfields_pages = datafield.findall('marc:subfield[@code="a"]', MARC_NAMESPACES)
+            if subfields_pages and subfields_pages[0].text:
+                metadata['pages'] = subfields_pages[0].text.strip()
+
+    return metadata
+
+
+def _query_dnb_sru(
+    query: str,
+    max_records: int = 1,
+    identifier_type: str = None,
+    identifier_value: str = None,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None
+) -> Optional[Dict]:
+    """
+    Internal helper to query DNB SRU API and parse MARC21 response.
+
+    Args:
+        query: SRU query string
+        max_records: Maximum number of records to retrieve
+        identifier_type: Type of identifier ('isbn', 'issn', or None)
+        identifier_value: Value of identifier (cleaned)
+        session: HTTP-Session (default: get_session())
+        limiter: Gemeinsamer AdaptiveRateLimiter (optional)
+
+    Returns:
+        Dict with metadata or None if the DNB found nothing
+
+    Raises:
+        DNBQueryError: If the request fails (see _query_dnb_sru_records) or the record cannot be parsed
+    """
+    records, _ = _query_dnb_sru_records(query, max_records, session=session, limiter=limiter)
+
+    # Extract first record
+    if not records:
         return None
 
+    try:
+        return _parse_marc_record(records[0], identifier_type, identifier_value)
+    except Exception as e:
+        raise DNBQueryError(f"DNB parse error for '{query}': {e}") from e
+
 
-def query_dnb_by_isbn(isbn: str, max_records: int = 1, max_retries: int = 3) -> Optional[Dict]:
+def query_dnb_by_isbn(isbn: str, max_records: int = 1, max_retries: int = 3, limiter: Optional[AdaptiveRateLimiter] = None, session: Optional[requests.Session] = None, raise_on_failure: bool = False) -> Optional[Dict]:
     """
     Fragt DNB API mit ISBN ab (mit automatischer Retry-Logik).
 
@@ -247,9 +519,13 @@ def query_dnb_by_isbn(isbn: str, max_records: int = 1, max_retries: int = 3) ->
         isbn: ISBN-Nummer (mit oder ohne Bindestriche)
         max_records: Max. Anzahl Ergebnisse
         max_retries: Maximale Anzahl an Retry-Versuchen bei Fehlern (default: 3)
+        limiter: Gemeinsamer AdaptiveRateLimiter für HTTP 429 (optional)
+        session: HTTP-Session (default: gemeinsame Session aus get_session())
+        raise_on_failure: DNBQueryError auslösen, wenn alle Versuche fehlschlagen,
+            statt None zurückzugeben (unterscheidet Fehler von Nicht-Gefunden, z.B. für Caches)
 
     Returns:
-        Dict mit Metadaten oder None bei Fehler/Nicht-Gefunden
+        Dict mit Metadaten oder None bei Nicht-Gefunden (bzw. Fehler, falls raise_on_failure=False)
 
     Example:
         >>> data = query_dnb_by_isbn('978-3-16-148410-0')
@@ -264,13 +540,135 @@ def query_dnb_by_isbn(isbn: str, max_records: int = 1, max_retries: int = 3) ->
 
     # Query mit Retry-Logik ausführen
     return _retry_with_backoff(
-        func=lambda: _query_dnb_sru(query, max_records, identifier_type='isbn', identifier_value=isbn_clean),
+        func=lambda: _query_dnb_sru(query, max_records, identifier_type='isbn', identifier_value=isbn_clean, session=session, limiter=limiter),
         max_retries=max_retries,
+        raise_on_failure=raise_on_failure,
         query_desc=f"ISBN {isbn_clean}"
     )
 
 
-def query_dnb_by_issn(issn: str, max_records: int = 1, max_retries: int = 3) -> Optional[Dict]:
+def _isbn_match_key(isbn: str) -> Optional[str]:
+    """
+    Vergleichsschlüssel für ISBNs: die ersten 12 Ziffern der ISBN-13.
+
+    ISBN-10 und ISBN-13 desselben Titels liefern so denselben Schlüssel
+    (Prüfziffer wird ignoriert).
+    """
+    digits = re.sub(r'[^0-9Xx]', '', isbn or '')
+    if len(digits) == 13:
+        return digits[:12]
+    if len(digits) == 10:
+        return '978' + digits[:9]
+    return None
+
+
+def query_dnb_by_isbns_bulk(
+    isbns: list,
+    batch_size: int = 20,
+    max_retries: int = 3,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    session: Optional[requests.Session] = None
+) -> Dict[str, Optional[Dict]]:
+    """
+    Fragt mehrere ISBNs mit wenigen SRU-Anfragen ab (ISBN-Disjunktion per OR).
+
+    Pro Batch wird eine Anfrage 'isbn=A or isbn=B or ...' gestellt und die
+    zurückgelieferten Records werden über ihre 020$a- und 020$z-ISBNs
+    (gültige bzw. ungültige/stornierte ISBN) den angefragten ISBNs zugeordnet.
+    Einzeln über query_dnb_by_isbn() abgefragt werden:
+    - alle ISBNs eines Batches, dessen Anfrage fehlschlägt
+    - nicht zugeordnete ISBNs, wenn die DNB mehr Treffer meldet
+      (srw:numberOfRecords) als sie geliefert hat (z.B. Mehrfachtreffer
+      durch Nachdrucke oder mehrbändige Werke)
+    - nicht zugeordnete ISBNs, wenn ein gelieferter Record keiner angefragten
+      ISBN zugeordnet werden konnte (Treffer über ein anderes ISBN-Feld des
+      isbn-Index); nur so ist "nicht gefunden" sicher
+
+    Args:
+        isbns: Liste von ISBNs (mit oder ohne Bindestriche)
+        batch_size: Anzahl ISBNs pro SRU-Anfrage
+        max_retries: Maximale Anzahl an Retry-Versuchen bei Fehlern (default: 3)
+        limiter: Gemeinsamer AdaptiveRateLimiter für HTTP 429 (optional)
+        session: HTTP-Session (default: gemeinsame Session aus get_session())
+
+    Returns:
+        Dict {isbn (wie übergeben): Metadaten-Dict oder None (nicht gefunden)}.
+        ISBNs, deren Abfrage auch einzeln fehlgeschlagen ist, fehlen im Dict.
+
+    Example:
+        >>> results = query_dnb_by_isbns_bulk(['978-3-16-148410-0', '3-16-148410-X'])
+        >>> results['978-3-16-148410-0']['title']
+    """
+    results = {}
+    unique_isbns = list(dict.fromkeys(isbns))
+
+    for start in range(0, len(unique_isbns), batch_size):
+        batch = unique_isbns[start:start + batch_size]
+        cleaned = {isbn: isbn.replace('-', '').replace(' ', '') for isbn in batch}
+        query = ' or '.join(f'isbn={isbn_clean}' for isbn_clean in cleaned.values())
+
+        try:
+            records, total = _retry_with_backoff(
+                func=lambda: _query_dnb_sru_records(query, max_records=len(batch) * 2, session=session, limiter=limiter),
+                max_retries=max_retries,
+                raise_on_failure=True,
+                query_desc=f"ISBN-Batch ({len(batch)} ISBNs)"
+            )
+        except DNBQueryError:
+            # Batch fehlgeschlagen: nur diese ISBNs einzeln abfragen
+            logger.warning(f"ISBN-Batch fehlgeschlagen, Fallback auf Einzelabfragen ({len(batch)} ISBNs)")
+            single_queries = batch
+        else:
+            # Records über alle 020$a/$z-ISBNs indexieren
+            records_by_key = {}
+            for record in records:
+                for sf in record.findall('marc:datafield[@tag="020"]/marc:subfield', MARC_NAMESPACES):
+                    if sf.get('code') not in ('a', 'z'):
+                        continue
+                    key = _isbn_match_key(re.split(r'[\s(]', (sf.text or '').strip())[0])
+                    if key and key not in records_by_key:
+                        records_by_key[key] = record
+
+            single_queries = []
+            unmatched = []
+            assigned = set()
+            for isbn, isbn_clean in cleaned.items():
+                record = records_by_key.get(_isbn_match_key(isbn_clean))
+                if record is None:
+                    unmatched.append(isbn)
+                    continue
+                assigned.add(id(record))
+                try:
+                    results[isbn] = _parse_marc_record(record, identifier_type='isbn', identifier_value=isbn_clean)
+                except Exception as e:
+                    logger.warning(f"DNB parse error for ISBN {isbn_clean}: {str(e)}")
+                    single_queries.append(isbn)
+
+            unassigned = sum(id(record) not in assigned for record in records)
+            if unmatched and (total > len(records) or unassigned):
+                # Trefferliste abgeschnitten oder Treffer ohne zuordenbare 020-ISBN:
+                # fehlende ISBNs sind nicht sicher "nicht gefunden"
+                logger.info(
+                    f"ISBN-Batch: {total} Treffer, {len(records)} geliefert, "
+                    f"{unassigned} nicht zugeordnet - {len(unmatched)} ISBNs werden einzeln abgefragt"
+                )
+                single_queries.extend(unmatched)
+            else:
+                for isbn in unmatched:
+                    results[isbn] = None
+
+        for isbn in single_queries:
+            try:
+                results[isbn] = query_dnb_by_isbn(
+                    isbn, max_retries=max_retries, limiter=limiter, session=session, raise_on_failure=True
+                )
+            except DNBQueryError:
+                logger.warning(f"ISBN {isbn} konnte nicht abgefragt werden - nicht im Ergebnis")
+
+    return results
+
+
+def query_dnb_by_issn(issn: str, max_records: int = 1, max_retries: int = 3, limiter: Optional[AdaptiveRateLimiter] = None, session: Optional[requests.Session] = None, raise_on_failure: bool = False) -> Optional[Dict]:
     """
     Fragt DNB API mit ISSN ab (mit automatischer Retry-Logik).
 
@@ -278,9 +676,13 @@ def query_dnb_by_issn(issn: str, max_records: int = 1, max_retries: int = 3) ->
         issn: ISSN-Nummer (mit oder ohne Bindestriche)
         max_records: Max. Anzahl Ergebnisse
         max_retries: Maximale Anzahl an Retry-Versuchen bei Fehlern (default: 3)
+        limiter: Gemeinsamer AdaptiveRateLimiter für HTTP 429 (optional)
+        session: HTTP-Session (default: gemeinsame Session aus get_session())
+        raise_on_failure: DNBQueryError auslösen, wenn alle Versuche fehlschlagen,
+            statt None zurückzugeben (unterscheidet Fehler von Nicht-Gefunden, z.B. für Caches)
 
     Returns:
-        Dict mit Metadaten oder None bei Fehler/Nicht-Gefunden
+        Dict mit Metadaten oder None bei Nicht-Gefunden (bzw. Fehler, falls raise_on_failure=False)
 
     Example:
         >>> data = query_dnb_by_issn('0028-0836')
@@ -295,13 +697,14 @@ def query_dnb_by_issn(issn: str, max_records: int = 1, max_retries: int = 3) ->
 
     # Query mit Retry-Logik ausführen
     return _retry_with_backoff(
-        func=lambda: _query_dnb_sru(query, max_records, identifier_type='issn', identifier_value=issn_clean),
+        func=lambda: _query_dnb_sru(query, max_records, identifier_type='issn', identifier_value=issn_clean, session=session, limiter=limiter),
         max_retries=max_retries,
+        raise_on_failure=raise_on_failure,
         query_desc=f"ISSN {issn_clean}"
     )
 
 
-def query_dnb_by_title_author(title: str, author: str = None, max_records: int = 1, max_retries: int = 3) -> Optional[Dict]:
+def query_dnb_by_title_author(title: str, author: str = None, max_records: int = 1, max_retries: int = 3, limiter: Optional[AdaptiveRateLimiter] = None, session: Optional[requests.Session] = None, raise_on_failure: bool = False) -> Optional[Dict]:
     """
     Fragt DNB API mit Titel und optional Autor ab (mit automatischer Retry-Logik).
 
@@ -318,9 +721,13 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
         author: Autor (optional, verbessert die Präzision)
         max_records: Max. Anzahl Ergebnisse
         max_retries: Maximale Anzahl an Retry-Versuchen bei Fehlern (default: 3)
+        limiter: Gemeinsamer AdaptiveRateLimiter für HTTP 429 (optional)
+        session: HTTP-Session (default: gemeinsame Session aus get_session())
+        raise_on_failure: DNBQueryError auslösen, wenn alle Versuche fehlschlagen,
+            statt None zurückzugeben (unterscheidet Fehler von Nicht-Gefunden, z.B. für Caches)
 
     Returns:
-        Dict mit Metadaten oder None bei Fehler/Nicht-Gefunden
+        Dict mit Metadaten oder None bei Nicht-Gefunden (bzw. Fehler, falls raise_on_failure=False)
 
     Example:
         >>> data = query_dnb_by_title_author('Faust', 'Goethe')
@@ -352,20 +759,20 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
         if author_lastname:
             # Strategie 1a: Original Titel (Phrase) + Autor
             query = f'tit="{title_clean}" and per={author_lastname}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 return result
 
             # Strategie 1b: Original Titel (Wörter) + Autor
             query = f'tit={title_clean} and per={author_lastname}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 return result
 
             # Strategie 1c: Normalisierter Titel + Autor (für Umlaute/Sonderzeichen)
             if title_normalized and title_normalized != title_clean:
                 query = f'tit={title_normalized} and per={author_lastname}'
-                result = _query_dnb_sru(query, max_records)
+                result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
                 if result:
                     logger.info(f"Match via normalized title: '{title_normalized[:40]}...'")
                     return result
@@ -373,7 +780,7 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
             # Strategie 1d: Truncated Titel + Autor (bei langen Titeln)
             if title_truncated:
                 query = f'tit={title_truncated} and per={author_lastname}'
-                result = _query_dnb_sru(query, max_records)
+                result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
                 if result:
                     logger.info(f"Match via truncated title: '{title_truncated}...'")
                     return result
@@ -381,20 +788,20 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
         # GRUPPE 2: Nur Titel (Fallback)
         # Strategie 2a: Original Titel (Phrase)
         query = f'tit="{title_clean}"'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 2b: Original Titel (Wörter)
         query = f'tit={title_clean}'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 2c: Normalisierter Titel (für Umlaute/Sonderzeichen)
         if title_normalized and title_normalized != title_clean:
             query = f'tit={title_normalized}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"Match via normalized title only: '{title_normalized[:40]}...'")
                 return result
@@ -402,7 +809,7 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
         # Strategie 2d: Truncated Titel (bei langen Titeln)
         if title_truncated:
             query = f'tit={title_truncated}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"Match via truncated title only: '{title_truncated}...'")
                 return result
@@ -417,11 +824,12 @@ def query_dnb_by_title_author(title: str, author: str = None, max_records: int =
     return _retry_with_backoff(
         func=_try_all_strategies,
         max_retries=max_retries,
+        raise_on_failure=raise_on_failure,
         query_desc=query_desc
     )
 
 
-def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_retries: int = 3) -> Optional[Dict]:
+def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_retries: int = 3, limiter: Optional[AdaptiveRateLimiter] = None, session: Optional[requests.Session] = None, raise_on_failure: bool = False) -> Optional[Dict]:
     """
     Fragt DNB API mit Titel und Jahr ab (mit automatischer Retry-Logik).
 
@@ -433,9 +841,13 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
         year: Erscheinungsjahr (4-stellig)
         max_records: Max. Anzahl Ergebnisse
         max_retries: Maximale Anzahl an Retry-Versuchen bei Fehlern
+        limiter: Gemeinsamer AdaptiveRateLimiter für HTTP 429 (optional)
+        session: HTTP-Session (default: gemeinsame Session aus get_session())
+        raise_on_failure: DNBQueryError auslösen, wenn alle Versuche fehlschlagen,
+            statt None zurückzugeben (unterscheidet Fehler von Nicht-Gefunden, z.B. für Caches)
 
     Returns:
-        Dict mit Metadaten oder None bei Fehler/Nicht-Gefunden
+        Dict mit Metadaten oder None bei Nicht-Gefunden (bzw. Fehler, falls raise_on_failure=False)
 
     Example:
         >>> data = query_dnb_by_title_year('Die Verwandlung', 1915)
@@ -462,20 +874,20 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
         # GRUPPE 1: Exaktes Jahr
         # Strategie 1a: Original Titel (Phrase) + exaktes Jahr
         query = f'tit="{title_clean}" and jhr={year_int}'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 1b: Original Titel (Wörter) + exaktes Jahr
         query = f'tit={title_clean} and jhr={year_int}'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 1c: Normalisierter Titel + exaktes Jahr
         if title_normalized and title_normalized != title_clean:
             query = f'tit={title_normalized} and jhr={year_int}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"TY match via normalized title: '{title_normalized[:40]}...'")
                 return result
@@ -483,7 +895,7 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
         # Strategie 1d: Truncated Titel + exaktes Jahr
         if title_truncated:
             query = f'tit={title_truncated} and jhr={year_int}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"TY match via truncated title: '{title_truncated}...'")
                 return result
@@ -491,20 +903,20 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
         # GRUPPE 2: Jahr-Range ±1 (für Publikationsvarianten)
         # Strategie 2a: Original Titel (Phrase) + Jahr ±1
         query = f'tit="{title_clean}" and jhr>={year_int-1} and jhr<={year_int+1}'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 2b: Original Titel (Wörter) + Jahr ±1
         query = f'tit={title_clean} and jhr>={year_int-1} and jhr<={year_int+1}'
-        result = _query_dnb_sru(query, max_records)
+        result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
         if result:
             return result
 
         # Strategie 2c: Normalisierter Titel + Jahr ±1
         if title_normalized and title_normalized != title_clean:
             query = f'tit={title_normalized} and jhr>={year_int-1} and jhr<={year_int+1}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"TY match via normalized title (±1 year): '{title_normalized[:40]}...'")
                 return result
@@ -512,7 +924,7 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
         # Strategie 2d: Truncated Titel + Jahr ±1
         if title_truncated:
             query = f'tit={title_truncated} and jhr>={year_int-1} and jhr<={year_int+1}'
-            result = _query_dnb_sru(query, max_records)
+            result = _query_dnb_sru(query, max_records, session=session, limiter=limiter)
             if result:
                 logger.info(f"TY match via truncated title (±1 year): '{title_truncated}...'")
                 return result
@@ -523,5 +935,6 @@ def query_dnb_by_title_year(title: str, year: int, max_records: int = 1, max_ret
     return _retry_with_backoff(
         func=_try_all_strategies,
         max_retries=max_retries,
+        raise_on_failure=raise_on_failure,
         query_desc=f"Title/Year: '{title_clean[:40]}...' ({year_int})"
     )
@@ -0,0 +1,149 @@
+"""
+Persistenter Cache für DNB API-Abfragen.
+
+Speichert die Ergebnisse der query_dnb_by_* Funktionen in einer lokalen
+SQLite-Datenbank, sodass wiederholte Läufe bereits beantwortete Anfragen
+nicht erneut an die DNB schicken. Auch leere Ergebnisse werden gecacht
+(Sentinel {'__miss__': True}), damit Nicht-Treffer nicht endlos neu
+abgefragt werden. Fehlgeschlagene Anfragen (DNBQueryError, siehe
+raise_on_failure) dürfen nicht gespeichert werden.
+
+Example:
+    >>> from dnb_api import query_dnb_by_isbn, DNBQueryError
+    >>> cache = DNBCache()
+    >>> key = DNBCache.make_key('query_dnb_by_isbn', ('978-3-16-148410-0',), {})
+    >>> hit, data = cache.get(key)
+    >>> if not hit:
+    ...     try:
+    ...         data = query_dnb_by_isbn('978-3-16-148410-0', raise_on_failure=True)
+    ...         cache.set(key, data)
+    ...     except DNBQueryError:
+    ...         data = None  # nicht cachen, nächster Lauf fragt erneut
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'data' / 'vdeh' / 'cache' / 'dnb'
+
+# Sentinel für "DNB hat nichts gefunden"
+MISS = {'__miss__': True}
+
+# Parameter, die das Ergebnis nicht beeinflussen und daher nicht in den Key eingehen
+_IGNORED_KWARGS = {'max_retries', 'limiter', 'session', 'raise_on_failure'}
+
+
+def _normalize_arg(value: Any) -> Any:
+    """Normalisiert Argumente für den Cache-Key (Strings: lowercase, Whitespace kollabiert)."""
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value.strip().lower())
+    return value
+
+
+class DNBCache:
+    """SQLite-basierter Key-Value-Cache für DNB-Ergebnisse (thread-safe)."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_age_days: Optional[float] = None,
+        force_refresh: bool = False
+    ):
+        """
+        Args:
+            cache_dir: Verzeichnis der Cache-Datenbank
+            max_age_days: Einträge älter als N Tage werden neu abgefragt (None = nie)
+            force_refresh: Cache beim Lesen ignorieren (Ergebnisse werden trotzdem gespeichert)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age_days = max_age_days
+        self.force_refresh = force_refresh
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_dir / 'dnb_cache.sqlite3', check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dnb_cache '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(func_name: str, args: tuple, kwargs: dict) -> str:
+        """Erzeugt den Cache-Key aus Funktionsname und normalisierten Argumenten."""
+        norm_args = [_normalize_arg(a) for a in args]
+        norm_kwargs = {
+            k: _normalize_arg(v) for k, v in sorted(kwargs.items()) if k not in _IGNORED_KWARGS
+        }
+        return json.dumps([func_name, norm_args, norm_kwargs], ensure_ascii=False, default=str)
+
+    def get(self, key: str) -> tuple[bool, Optional[dict]]:
+        """
+        Liest einen Eintrag und zählt ihn in hits bzw. misses.
+
+        Returns:
+            Tuple aus (Treffer, Ergebnis) - Ergebnis ist None für gecachte Nicht-Treffer
+        """
+        row = None
+        if not self.force_refresh:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT value, created FROM dnb_cache WHERE key = ?', (key,)
+                ).fetchone()
+
+        if row is not None and self.max_age_days is not None \
+                and time.time() - row[1] > self.max_age_days * 86400:
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is None:
+            return False, None
+
+        result = json.loads(row[0])
+        return True, (None if result == MISS else result)
+
+    def set(self, key: str, result: Optional[dict]) -> None:
+        """
+        Speichert ein Ergebnis (None wird als MISS-Sentinel abgelegt).
+
+        Nur für tatsächlich beantwortete Anfragen aufrufen: None bedeutet
+        "DNB hat nichts gefunden" und wird dauerhaft gecacht.
+        """
+        value = json.dumps(MISS if result is None else result, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO dnb_cache (key, value, created) VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Löscht alle Einträge."""
+        with self._lock:
+            self._conn.execute('DELETE FROM dnb_cache')
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Schließt die Datenbankverbindung."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM dnb_cache').fetchone()[0]
+
@@ -1,6 +1,6 @@
 """Data fusion module for merging VDEh and DNB bibliographic data."""
 
 from .fusion_engine import FusionEngine, FusionResult
-from .ollama_client import OllamaClient, OllamaUnavailableError
+from .ollama_client import OllamaClient, CachedOllamaClient, OllamaUnavailableError
 
-__all__ = ['FusionEngine', 'FusionResult', 'OllamaClient', 'OllamaUnavailableError']
+__all__ = ['FusionEngine', 'FusionResult', 'OllamaClient', 'CachedOllamaClient', 'OllamaUnavailableError']
@@ -7,6 +7,8 @@ Date: December 2025
 
 import json
 import logging
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 from typing import Dict, Optional, Tuple
 from pathlib import Path
@@ -18,9 +20,17 @@ from .utils import compare_fields, format_record_for_display, calculate_pages_ma
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=100_000)
+def _sequence_similarity(t1: str, t2: str) -> float:
+    """SequenceMatcher ratio for two normalized titles (memoized, pairs repeat across records)."""
+    return SequenceMatcher(None, t1, t2).ratio()
+
+
 class FusionResult:
     """Container for fusion result data with enhanced tracking."""
 
+    FIELDS = ('title', 'authors', 'year', 'publisher', 'pages', 'isbn', 'issn')
+
     def __init__(
         self,
         title: Optional[str] = None,
@@ -83,6 +93,53 @@ class FusionResult:
         self.fusion_selected_variant = fusion_selected_variant
         self.loc_match_rejected = loc_match_rejected
 
+    @staticmethod
+    def from_frames(
+        vdeh_df: pd.DataFrame,
+        other_df: pd.DataFrame,
+        confirmations: Optional[pd.DataFrame] = None,
+        other_source: str = 'dnb'
+    ) -> pd.DataFrame:
+        """
+        Vectorized enrichment of whole record frames (VDEh values are never replaced).
+
+        Same rules as the per-field loop in merge_record, applied column-wise:
+        VDEh value present → 'vdeh' (or 'confirmed' if the other source has a value
+        and the field is marked in confirmations), else other source → other_source,
+        else None.
+
+        Args:
+            vdeh_df: VDEh records (columns from FIELDS, missing columns = empty)
+            other_df: DNB/LoC records, row-aligned with vdeh_df
+            confirmations: Boolean frame marking confirmed fields per record (optional)
+            other_source: Source label for enriched values
+
+        Returns:
+            DataFrame with one column per field and per '<field>_source'
+            (rows can be passed as FusionResult(**row))
+        """
+        fields = list(FusionResult.FIELDS)
+        vdeh = vdeh_df.reindex(columns=fields).astype(object)
+        other = other_df.reindex(columns=fields).astype(object)
+        other.index = vdeh.index
+
+        vdeh_mask = vdeh.notna().to_numpy()
+        other_mask = other.notna().to_numpy()
+        if confirmations is None:
+            confirm_mask = np.zeros_like(vdeh_mask)
+        else:
+            confirm_mask = confirmations.reindex(columns=fields, fill_value=False).to_numpy(dtype=bool)
+
+        values = vdeh.where(vdeh_mask, other)
+        values = values.where(values.notna(), None)
+        sources = np.where(
+            vdeh_mask & other_mask & confirm_mask, 'confirmed',
+            np.where(vdeh_mask, 'vdeh', np.where(other_mask, other_source, None))
+        )
+
+        sources = pd.DataFrame(sources, index=values.index, columns=[f'{f}_source' for f in fields], dtype=object)
+        return pd.concat([values, sources], axis=1)
+
     def to_dict(self) -> Dict:
         """Convert to dictionary for DataFrame storage."""
         return {
@@ -161,7 +218,7 @@ class FusionEngine:
         t1 = str(title1).lower().strip()
         t2 = str(title2).lower().strip()
 
-        return SequenceMatcher(None, t1, t2).ratio()
+        return _sequence_similarity(t1, t2)
 
     @staticmethod
     def validate_dnb_match(
@@ -6,12 +6,18 @@ Date: November 2025
 """
 
 import time
+import hashlib
 import logging
+import sqlite3
+import threading
 import requests
+from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / 'data' / 'vdeh' / 'cache' / 'ollama'
+
 
 class OllamaUnavailableError(Exception):
     """Raised when Ollama is repeatedly unreachable (timeout/connection error)."""
@@ -159,3 +165,90 @@ class OllamaClient:
                 f"Ollama unavailable after {max_retries} attempts: {last_err}"
             )
         return None
+
+
+class CachedOllamaClient(OllamaClient):
+    """
+    OllamaClient with a persistent SQLite cache for query responses.
+
+    Responses are keyed by SHA-256 of model, sampling options and prompt, so
+    re-running the same fusion skips the LLM round-trip entirely. Failed
+    queries (None) are not cached.
+    """
+
+    def __init__(self, *args, cache_dir: Path = DEFAULT_CACHE_DIR, **kwargs):
+        """
+        Initialize cached Ollama client.
+
+        Args:
+            *args: Positional arguments for OllamaClient
+            cache_dir: Directory of the cache database
+            **kwargs: Keyword arguments for OllamaClient
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_dir / 'ollama_cache.sqlite3', check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS ollama_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, num_predict: int, temperature: float) -> str:
+        """Build the cache key from everything that determines the response."""
+        raw = f"{model}|{num_predict}|{temperature}|{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def query(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        timeout_sec: Optional[int] = None,
+        abort_on_timeout: Optional[bool] = None,
+        num_predict: int = 180,
+        temperature: float = 0.1
+    ) -> Optional[str]:
+        """
+        Query Ollama, answering repeated prompts from the cache.
+
+        Args/Returns/Raises: see OllamaClient.query
+        """
+        key = self.make_key(model or self.model, prompt, num_predict, temperature)
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response FROM ollama_cache WHERE key = ?', (key,)
+            ).fetchone()
+        if row is not None:
+            self.hits += 1
+            return row[0]
+
+        self.misses += 1
+        response = super().query(
+            prompt,
+            model=model,
+            max_retries=max_retries,
+            timeout_sec=timeout_sec,
+            abort_on_timeout=abort_on_timeout,
+            num_predict=num_predict,
+            temperature=temperature
+        )
+        if response is not None:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO ollama_cache (key, response) VALUES (?, ?)',
+                    (key, response)
+                )
+                self._conn.commit()
+        return response
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
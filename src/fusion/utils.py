@@ -7,12 +7,17 @@ Date: November 2025
 
 import re
 import unicodedata
+import numpy as np
 import pandas as pd
 import logging
 from typing import Optional, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Page count: number before a page indicator ("188 S.", "250 p.", "192 pages"),
+# before a comma/colon, or at the end of the string
+_PAGE_NUMBER_RE = re.compile(r'(\d+)\s*(?:S\.|p\.|pages?|Seiten?|[,:]|$)', re.IGNORECASE)
+
 
 def normalize_string(val) -> Optional[str]:
     """
@@ -168,24 +173,43 @@ def extract_page_number(pages_str: Optional[str]) -> Optional[int]:
     # Convert to string and normalize
     pages_str = str(pages_str).strip()
 
-    # Pattern: Find largest number (ignoring Roman numerals at start)
-    # Looks for digits followed by optional space and page indicator
-    patterns = [
-        r'(\d+)\s*(?:S\.|p\.|pages?|Seiten?)',  # "188 S.", "250 p."
-        r'(\d+)\s*$',  # Just number at end
-        r'(\d+)\s*[,:]',  # Number before comma/colon
-    ]
+    # Find largest number (ignoring Roman numerals at start), single scan
+    largest = None
+    for match in _PAGE_NUMBER_RE.finditer(pages_str):
+        number = int(match.group(1))
+        if largest is None or number > largest:
+            largest = number
 
-    numbers = []
-    for pattern in patterns:
-        matches = re.findall(pattern, pages_str, re.IGNORECASE)
-        numbers.extend([int(m) for m in matches])
+    # Largest number found = main pagination
+    return largest
 
-    if not numbers:
-        return None
 
-    # Return largest number found (main pagination)
-    return max(numbers)
+def extract_page_number_series(pages: pd.Series) -> pd.Series:
+    """
+    Vectorized variant of extract_page_number for a whole column.
+
+    Args:
+        pages: Series of page strings from MARC21 field 300
+
+    Returns:
+        Int64 Series aligned to the input, <NA> where no page count was found
+    """
+    values = pages.reset_index(drop=True).astype('string').str.strip()
+    numbers = values.str.extractall(_PAGE_NUMBER_RE)[0].astype('Int64')
+    page_numbers = numbers.groupby(level=0).max().reindex(values.index)
+    return page_numbers.set_axis(pages.index)
+
+
+def _relative_pages_difference(num1, num2):
+    """
+    Relative difference of two page counts (|a - b| / mean, 1.0 if the mean is 0).
+
+    Works element-wise on scalars and float arrays alike.
+    """
+    num1 = np.asarray(num1, dtype='float64')
+    num2 = np.asarray(num2, dtype='float64')
+    avg = (num1 + num2) / 2
+    return np.where(avg > 0, np.abs(num1 - num2) / np.where(avg > 0, avg, 1.0), 1.0)
 
 
 def calculate_pages_match(pages1: Optional[str], pages2: Optional[str], tolerance: float = 0.1) -> Tuple[bool, Optional[float]]:
@@ -208,9 +232,7 @@ def calculate_pages_match(pages1: Optional[str], pages2: Optional[str], toleranc
         return (False, None)
 
     # Calculate relative difference
-    diff = abs(num1 - num2)
-    avg = (num1 + num2) / 2
-    diff_percent = diff / avg if avg > 0 else 1.0
+    diff_percent = float(_relative_pages_difference(num1, num2))
 
     matches = diff_percent <= tolerance
 
@@ -220,3 +242,29 @@ def calculate_pages_match(pages1: Optional[str], pages2: Optional[str], toleranc
     )
 
     return (matches, diff_percent)
+
+
+def calculate_pages_match_series(
+    pages1: pd.Series,
+    pages2: pd.Series,
+    tolerance: float = 0.1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized variant of calculate_pages_match for two aligned columns.
+
+    Args:
+        pages1: First page strings
+        pages2: Second page strings (same length/order as pages1)
+        tolerance: Allowed relative difference (default: 0.1 = 10%)
+
+    Returns:
+        Tuple of (matches: bool array, difference_percent: float array, NaN where not comparable)
+    """
+    num1 = extract_page_number_series(pages1).to_numpy(dtype='float64', na_value=np.nan)
+    num2 = extract_page_number_series(pages2).to_numpy(dtype='float64', na_value=np.nan)
+
+    comparable = ~np.isnan(num1) & ~np.isnan(num2)
+    diff_percent = np.where(comparable, _relative_pages_difference(num1, num2), np.nan)
+    matches = comparable & (np.nan_to_num(diff_percent, nan=np.inf) <= tolerance)
+
+    return matches, diff_percent
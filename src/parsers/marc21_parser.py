@@ -31,15 +31,21 @@ Datum: Dezember 2025
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import xml.etree.ElementTree as ET
 import re
 import os
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Vorkompilierte Muster für die Hot Paths der Feld-Extraktion (einmal pro Record aufgerufen)
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_NON_ISBN_CHARS_RE = re.compile(r'[^0-9X]')
+
 
 def _get_field(document: ET.Element, tag: str, code: Optional[str] = None) -> Optional[str]:
     """
@@ -70,68 +76,91 @@ def _get_field(document: ET.Element, tag: str, code: Optional[str] = None) -> Op
         return "; ".join(texts) if texts else None
 
 
-def parse_bibliography(file_path: str, max_records: Optional[int] = None) -> pd.DataFrame:
+def iter_bibliography(
+    file_path: str,
+    max_records: Optional[int] = None,
+    batch_size: int = 10_000
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Parst eine MARC21 XML-Datei und extrahiert bibliographische Grunddaten.
+    Liest eine MARC21 XML-Datei inkrementell und liefert Records in Batches.
 
-    Dieser robuste Parser verwendet xml.etree.ElementTree und extrahiert:
-    - Titel (mit Zusätzen)
-    - Autoren (alle gefundenen)
-    - Erscheinungsjahr
-    - Verlag (Name + Ort)
-    - ISBN
-    - ISSN
-    - Seitenzahl
+    Verwendet ET.iterparse, sodass nie der gesamte XML-Baum im Speicher liegt:
+    jedes <document> wird nach der Extraktion wieder freigegeben. Der
+    Speicherbedarf ist damit O(batch_size) statt O(Anzahl Records).
 
     Args:
         file_path (str): Pfad zur MARC21 XML-Datei
         max_records (Optional[int]): Maximale Anzahl zu verarbeitender Records (None = alle)
+        batch_size (int): Anzahl Records pro Batch
 
-    Returns:
-        pd.DataFrame: DataFrame mit Spalten ['id', 'title', 'authors', 'year', 'publisher',
-                      'isbn', 'issn', 'pages', 'authors_str', 'num_authors',
-                      'authors_affiliation_str', 'num_authors_affiliation']
+    Yields:
+        List[Dict[str, Any]]: Batch von Record-Dicts (siehe _extract_basic_record_data)
 
     Raises:
         FileNotFoundError: Wenn die XML-Datei nicht gefunden wird
         Exception: Bei XML-Parsing-Fehlern
     """
-
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"XML-Datei nicht gefunden: {file_path}")
 
     file_size_mb = os.path.getsize(file_path) / (1024*1024)
     logger.info(f"Starting MARC21 parser for bibliographic data from {file_path} ({file_size_mb:.1f} MB)")
 
-    records = []
+    batch = []
     record_count = 0
+    depth = 0
+    root = None
 
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
 
-        # Alle <document> Elemente finden
-        documents = root.findall('document')
-        total_records = len(documents)
-        logger.info(f"Found {total_records:,} MARC21 documents")
+            depth -= 1
+
+            # Nur <document> direkt unterhalb des Root-Elements
+            if depth != 1 or elem.tag != 'document':
+                continue
 
-        for idx, document in enumerate(documents):
             if max_records and record_count >= max_records:
                 break
 
-            record = _extract_basic_record_data(document, record_count)
-            records.append(record)
+            batch.append(_extract_basic_record_data(elem, record_count))
             record_count += 1
 
+            # Verarbeitete Documents freigeben
+            root.clear()
+
             if record_count % 5000 == 0:
                 logger.info(f"Processed {record_count:,} records")
 
-        logger.info(f"Successfully processed {record_count:,} records")
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
 
     except Exception as e:
         raise Exception(f"Fehler beim Parsen der MARC21 XML-Datei: {str(e)}")
 
-    # DataFrame erstellen
+    if batch:
+        yield batch
+
+    logger.info(f"Successfully processed {record_count:,} records")
+
+
+def _records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Erstellt den Bibliographie-DataFrame inkl. abgeleiteter Autoren-Spalten.
+
+    Args:
+        records: Liste von Record-Dicts (alle Keys werden zu Spalten)
+
+    Returns:
+        DataFrame mit Record-Spalten plus authors_str/num_authors und
+        authors_affiliation_str/num_authors_affiliation
+    """
     df = pd.DataFrame(records)
 
     # Autoren-Strings für einfache Anzeige
@@ -142,12 +171,137 @@ def parse_bibliography(file_path: str, max_records: Optional[int] = None) -> pd.
     df['authors_affiliation_str'] = df['authors_affiliation'].apply(lambda x: ' | '.join(x) if x else '')
     df['num_authors_affiliation'] = df['authors_affiliation'].apply(len)
 
+    return df
+
+
+def parse_bibliography(file_path: str, max_records: Optional[int] = None) -> pd.DataFrame:
+    """
+    Parst eine MARC21 XML-Datei und extrahiert bibliographische Grunddaten.
+
+    Dieser robuste Parser verwendet xml.etree.ElementTree und extrahiert:
+    - Titel (mit Zusätzen)
+    - Autoren (alle gefundenen)
+    - Erscheinungsjahr
+    - Verlag (Name + Ort)
+    - ISBN
+    - ISSN
+    - Seitenzahl
+
+    Args:
+        file_path (str): Pfad zur MARC21 XML-Datei
+        max_records (Optional[int]): Maximale Anzahl zu verarbeitender Records (None = alle)
+
+    Returns:
+        pd.DataFrame: DataFrame mit Spalten ['id', 'title', 'authors', 'year', 'publisher',
+                      'isbn', 'issn', 'pages', 'authors_str', 'num_authors',
+                      'authors_affiliation_str', 'num_authors_affiliation']
+
+    Raises:
+        FileNotFoundError: Wenn die XML-Datei nicht gefunden wird
+        Exception: Bei XML-Parsing-Fehlern
+    """
+    records = []
+    for batch in iter_bibliography(file_path, max_records=max_records):
+        records.extend(batch)
+
+    # DataFrame erstellen
+    df = _records_to_dataframe(records)
+
     memory_mb = df.memory_usage(deep=True).sum() / 1024**2
     logger.info(f"DataFrame created: {len(df):,} rows, {len(df.columns)} columns, {memory_mb:.1f} MB")
 
     return df
 
 
+def _bibliography_schema(df: pd.DataFrame) -> pa.Schema:
+    """
+    Arrow-Schema für write_bibliography_parquet aus dem ersten Batch.
+
+    Bekannte Spalten erhalten feste Typen, damit alle Row Groups übereinstimmen,
+    auch wenn ein Batch z.B. kein einziges Jahr enthält. Das Jahr ist float64
+    (fehlende Jahre = null) wie in parse_bibliography(). Weitere Record-Keys
+    werden mit ihrem Typ aus dem ersten Batch übernommen (reine None-Spalten
+    als string).
+
+    Args:
+        df: DataFrame des ersten Batches (aus _records_to_dataframe)
+
+    Returns:
+        pa.Schema für alle Row Groups
+    """
+    known_types = {
+        'id': pa.string(),
+        'title': pa.string(),
+        'authors': pa.list_(pa.string()),
+        'authors_affiliation': pa.list_(pa.string()),
+        'year': pa.float64(),
+        'publisher': pa.string(),
+        'isbn': pa.string(),
+        'issn': pa.string(),
+        'pages': pa.string(),
+        'language': pa.string(),
+        'authors_str': pa.string(),
+        'num_authors': pa.int64(),
+        'authors_affiliation_str': pa.string(),
+        'num_authors_affiliation': pa.int64(),
+    }
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+
+    fields = []
+    for field in inferred:
+        if field.name in known_types:
+            field = field.with_type(known_types[field.name])
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def write_bibliography_parquet(
+    file_path: str,
+    output_path: str,
+    max_records: Optional[int] = None,
+    batch_size: int = 10_000
+) -> int:
+    """
+    Parst eine MARC21 XML-Datei batchweise direkt in eine Parquet-Datei.
+
+    Im Gegensatz zu parse_bibliography() wird kein vollständiger DataFrame
+    aufgebaut: jeder Batch aus iter_bibliography() wird als eigene Row Group
+    geschrieben, der Speicherbedarf ist O(batch_size). Die Spalten entsprechen
+    denen von parse_bibliography().
+
+    Args:
+        file_path (str): Pfad zur MARC21 XML-Datei
+        output_path (str): Pfad der zu schreibenden Parquet-Datei
+        max_records (Optional[int]): Maximale Anzahl zu verarbeitender Records (None = alle)
+        batch_size (int): Anzahl Records pro Batch / Row Group
+
+    Returns:
+        int: Anzahl geschriebener Records
+
+    Raises:
+        FileNotFoundError: Wenn die XML-Datei nicht gefunden wird
+        Exception: Bei XML-Parsing-Fehlern
+    """
+    writer = None
+    total = 0
+    try:
+        for batch in iter_bibliography(file_path, max_records=max_records, batch_size=batch_size):
+            df = _records_to_dataframe(batch)
+            if writer is None:
+                schema = _bibliography_schema(df)
+                writer = pq.ParquetWriter(output_path, schema, compression='zstd')
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+            total += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(f"Parquet written: {output_path} ({total:,} rows)")
+    return total
+
+
 def _extract_basic_record_data(document: ET.Element, record_count: int) -> Dict[str, Any]:
     """
     Extrahiert die grundlegenden bibliographischen Daten aus einem MARC21 Record.
@@ -424,7 +578,7 @@ def _parse_year_from_text(text: str) -> Optional[int]:
     Returns:
         Jahr als Integer oder None
     """
-    year_match = re.search(r'\b(19|20)\d{2}\b', text)
+    year_match = _YEAR_RE.search(text)
     if year_match:
         year = int(year_match.group())
         # Plausibilitätsprüfung: Jahr zwischen 1800 und 2030
@@ -466,7 +620,7 @@ def _find_standard_numbers(document: ET.Element) -> tuple[Optional[str], Optiona
 
 def _is_issn(text: str) -> bool:
     """Prüft ob ein Text eine ISSN ist (8 Ziffern, optional mit Bindestrich)"""
-    cleaned = re.sub(r'[^0-9X]', '', text.upper())
+    cleaned = _NON_ISBN_CHARS_RE.sub('', text.upper())
     return len(cleaned) == 8
 
 
@@ -486,7 +640,7 @@ def _format_isbn(isbn: str) -> str:
     Returns:
         Formatierte und bereinigte ISBN
     """
-    isbn = re.sub(r'[^0-9X]', '', isbn.upper())
+    isbn = _NON_ISBN_CHARS_RE.sub('', isbn.upper())
 
     # Bereinige doppelte/konkatenierte ISBNs
     if len(isbn) == 20:  # Zwei ISBN-10 konkateniert
@@ -511,7 +665,7 @@ def _format_isbn(isbn: str) -> str:
 
 def _format_issn(issn: str) -> str:
     """Formatiert ISSN mit Bindestrich"""
-    issn = re.sub(r'[^0-9X]', '', issn.upper())
+    issn = _NON_ISBN_CHARS_RE.sub('', issn.upper())
     if len(issn) == 8:
         return f"{issn[0:4]}-{issn[4:8]}"
     return issn
@@ -559,13 +713,11 @@ def analyze_bibliography_data(df: pd.DataFrame) -> None:
         logger.info(f"Median year: {int(years.median())}")
 
     # Autoren-Statistik
-    all_authors = []
-    for authors_list in df['authors']:
-        if authors_list:
-            all_authors.extend(authors_list)
+    # explode() funktioniert für Listen (parse_bibliography) und Arrays (aus Parquet gelesen)
+    all_authors = df['authors'].explode().dropna()
 
-    if all_authors:
-        unique_authors = len(set(all_authors))
+    if len(all_authors) > 0:
+        unique_authors = all_authors.nunique()
         logger.info(f"Unique authors: {unique_authors:,}")
 
 